@@ -0,0 +1,74 @@
+"""
+Compare the stdlib and orjson JSON renderers and parsers on `GoalListView` output.
+
+Usage:
+    python benchmarks/bench_renderers.py [--goals 1000] [--repeat 50]
+"""
+import argparse
+import datetime
+import io
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from config.parsers import ORJSONParser  # noqa: E402
+from config.renderers import ORJSONRenderer  # noqa: E402
+from core.models import User  # noqa: E402
+from goals.models import Goal  # noqa: E402
+from goals.serializers import GoalSerializer  # noqa: E402
+
+
+def build_page(size: int) -> dict:
+    """Build a `goal/list` page the way the view does, from unsaved model instances."""
+    user = User(id=1, username='user', first_name='Иван', last_name='Петров', email='user@example.com')
+    now = timezone.now()
+    goals = [
+        Goal(
+            id=index, user=user, category_id=index % 10 + 1, title=f'Цель номер {index}',
+            description='Описание цели ' * 10, due_date=datetime.date(2024, 1, 1) + datetime.timedelta(days=index),
+            status=index % 4 + 1, priority=index % 4 + 1, created=now, updated=now,
+        )
+        for index in range(size)
+    ]
+    return {'count': size, 'next': None, 'previous': None, 'results': GoalSerializer(goals, many=True).data}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--goals', type=int, default=1000, help='Goals on the page')
+    parser.add_argument('--repeat', type=int, default=50, help='Runs of every measurement')
+    args = parser.parse_args()
+
+    page = build_page(args.goals)
+    body = JSONRenderer().render(page)
+    assert ORJSONRenderer().render(page) == body, 'Renderers disagree'
+    print(f'{args.goals} goals, {len(body) / 1024:.0f} KiB of JSON, best of {args.repeat} runs')
+
+    cases = [
+        ('render', JSONRenderer().render, ORJSONRenderer().render, page),
+        ('parse', lambda data: JSONParser().parse(io.BytesIO(data)),
+         lambda data: ORJSONParser().parse(io.BytesIO(data)), body),
+    ]
+    for name, stdlib, fast, argument in cases:
+        stdlib_time = min(timeit.repeat(lambda: stdlib(argument), number=1, repeat=args.repeat))
+        fast_time = min(timeit.repeat(lambda: fast(argument), number=1, repeat=args.repeat))
+        print(
+            f'{name:>6}: json {stdlib_time * 1000:7.2f} ms, orjson {fast_time * 1000:7.2f} ms, '
+            f'x{stdlib_time / fast_time:.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare a fresh connection per Telegram API call with the pooled `TgClient` session against a local fake API.
+
+The fake server can delay every new connection to stand in for the TCP and TLS handshakes to api.telegram.org.
+
+Usage:
+    python benchmarks/bench_tg_client.py [--messages 300] [--handshake-ms 50]
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.tg.client import TgClient  # noqa: E402
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    """Answers `sendMessage` with keep-alive, counting the connections it accepts."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    handshake_delay = 0.0
+    connections = 0
+
+    def setup(self):
+        type(self).connections += 1
+        time.sleep(self.handshake_delay)
+        super().setup()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        body = json.dumps({
+            'ok': True,
+            'result': {'message_id': 1, 'chat': {'id': payload['chat_id']}, 'text': payload['text']},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def send_unpooled(api_url: str, messages: int) -> None:
+    """The previous client: a module-level `requests` call, hence a new connection, per message."""
+    for index in range(messages):
+        response = requests.post(f'{api_url}/bottoken/sendMessage', json={'chat_id': 1, 'text': f'Message {index}'})
+        response.raise_for_status()
+
+
+def send_pooled(api_url: str, messages: int) -> None:
+    client = TgClient('token', api_url=api_url)
+    for index in range(messages):
+        assert client.send_message(chat_id=1, text=f'Message {index}').ok
+    client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=300, help='Messages sent by each client')
+    parser.add_argument('--handshake-ms', type=float, default=50, help='Delay of every new connection')
+    args = parser.parse_args()
+
+    FakeTelegramHandler.handshake_delay = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeTelegramHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f'http://127.0.0.1:{server.server_port}'
+    print(f'{args.messages} messages, {args.handshake_ms:g} ms per new connection')
+
+    try:
+        for name, send in [('unpooled', send_unpooled), ('pooled', send_pooled)]:
+            FakeTelegramHandler.connections = 0
+            start = time.perf_counter()
+            send(api_url, args.messages)
+            elapsed = time.perf_counter() - start
+            print(
+                f'{name:>8}: {elapsed:6.2f} s, {elapsed / args.messages * 1000:6.2f} ms per message, '
+                f'{FakeTelegramHandler.connections} connections'
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from bot.models import TgUser
+from bot.models import TgOutboxMessage, TgUser
 
 
 @admin.register(TgUser)
@@ -8,3 +8,10 @@ class TgUserAdmin(admin.ModelAdmin):
     list_display = ('tg_id', 'username', 'verification_code')
     search_fields = ('user', 'tg_id')
     readonly_fields = ('verification_code',)
+
+
+@admin.register(TgOutboxMessage)
+class TgOutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('chat_id', 'created', 'attempts', 'next_attempt', 'sent')
+    search_fields = ('chat_id',)
+    readonly_fields = ('created', 'attempts', 'sent', 'last_error')
@@ -1,12 +1,15 @@
+import asyncio
 import secrets
 
 from django.core.management.base import BaseCommand, CommandError
 
 from bot.models import TgUser
-from bot.tg.bot import get_user_goals, show_categories
-from bot.tg.client import TgClient
-from bot.tg.scheme import Message
-from config.settings import TOKEN_BOT
+from bot.tg.bot import Reply, get_goals_page, get_user_goals, show_categories
+from bot.tg.client import AsyncTgClient, TgClient
+from bot.tg.dispatcher import Lane, OutboundDispatcher
+from bot.tg.engine import AsyncBotEngine
+from bot.tg.scheme import CallbackQuery, Message, Update
+from config.settings import TG_CHAT_RATE, TG_GLOBAL_RATE, TG_POOL_SIZE, TG_RETRIES, TG_TIMEOUT, TOKEN_BOT
 
 
 class Command(BaseCommand):
@@ -14,24 +17,70 @@ class Command(BaseCommand):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.client = TgClient(TOKEN_BOT)
+        self.client = TgClient(TOKEN_BOT, pool_size=TG_POOL_SIZE, timeout=TG_TIMEOUT, retries=TG_RETRIES)
+        self.dispatcher = OutboundDispatcher(
+            self.client, global_rate=TG_GLOBAL_RATE, chat_rate=TG_CHAT_RATE, senders=TG_POOL_SIZE
+        )
         self.users_data = {}
 
     def add_arguments(self, parser):
         parser.add_argument('runbot', nargs='?', default='runbot')
+        parser.add_argument(
+            '--engine', choices=['sync', 'async'], default='sync',
+            help='"async" answers the chats concurrently instead of one message at a time',
+        )
+        parser.add_argument('--workers', type=int, default=16, help='Database threads of the async engine')
 
     def handle(self, *args, **options):
-        if options['runbot']:
-            offset = 0
-            try:
-                while True:
-                    res = self.client.get_updates(offset=offset)
-
-                    for item in res.result:
-                        offset = item.update_id + 1
-                        self.handle_message(item.message)
-            except Exception as e:
-                raise CommandError(f'An error occurred: {e}')
+        if not options['runbot']:
+            return
+        self.dispatcher.start()
+        try:
+            if options['engine'] == 'async':
+                asyncio.run(self.run_async(workers=options['workers']))
+            else:
+                self.run_sync()
+        finally:
+            self.dispatcher.close(timeout=TG_TIMEOUT)
+
+    def run_sync(self) -> None:
+        offset = 0
+        try:
+            while True:
+                res = self.client.get_updates(offset=offset)
+
+                for item in res.result:
+                    offset = item.update_id + 1
+                    self.handle_update(item)
+        except Exception as e:
+            raise CommandError(f'An error occurred: {e}')
+
+    async def run_async(self, workers: int) -> None:
+        async with AsyncTgClient(TOKEN_BOT, timeout=TG_TIMEOUT) as client:
+            # Replies are queued to the dispatcher by the handler
+            await AsyncBotEngine(client, self.handle_update, workers=workers).run()
+
+    def handle_update(self, update: Update) -> None:
+        if update.message is not None:
+            self.handle_message(update.message)
+        elif update.callback_query is not None:
+            self.handle_callback_query(update.callback_query)
+
+    def handle_callback_query(self, callback_query: CallbackQuery) -> None:
+        """
+        Handle a press of an inline button, e.g. "Next page" of the goals.
+
+        Args:
+            callback_query (CallbackQuery): Callback query with the message of the button and its data.
+        """
+        self.client.answer_callback_query(callback_query.id)
+        if callback_query.message is None or not callback_query.data:
+            return
+        chat_id = callback_query.message.chat.id
+        user_id = TgUser.objects.filter(tg_id=chat_id, user__isnull=False).values_list('user_id', flat=True).first()
+        reply = get_goals_page(user_id, callback_query.data) if user_id is not None else None
+        if reply is not None:
+            self.dispatcher.submit(chat_id=chat_id, text=reply.text, reply_markup=reply.reply_markup)
 
     def handle_message(self, message: Message) -> None:
         """
@@ -40,6 +89,18 @@ class Command(BaseCommand):
         Args:
             message (Message): Message object with chat_id and message text.
         """
+        reply, lane = self.respond(message)
+        self.dispatcher.submit(chat_id=message.chat.id, text=reply.text, lane=lane, reply_markup=reply.reply_markup)
+
+    def respond(self, message: Message) -> tuple[Reply, Lane]:
+        """
+        Build the answer to a message written by the user in the Bot's chat.
+
+        Args:
+            message (Message): Message object with chat_id and message text.
+        Returns:
+            tuple[Reply, Lane]: A message to be sent back to the user and its priority lane.
+        """
         chat_id = message.chat.id
         tg_user, _ = TgUser.objects.get_or_create(
             tg_id=chat_id, defaults={'username': message.chat.username})
@@ -48,23 +109,25 @@ class Command(BaseCommand):
             token = secrets.token_urlsafe()[:16]
             tg_user.verification_code = token  # Set the new verification code
             tg_user.save()
-            message = f"Hello!\nIt seems you need to link your account.\nHere's the verification code: {token}"
-            self.client.send_message(chat_id=chat_id, text=message)
-        else:
-            self.handle_auth_user(tg_user=tg_user, message=message)
+            text = f"Hello!\nIt seems you need to link your account.\nHere's the verification code: {token}"
+            return Reply(text), Lane.urgent
+        return self.handle_auth_user(tg_user=tg_user, message=message), Lane.normal
 
-    def handle_auth_user(self, tg_user: TgUser, message: Message) -> None:
+    def handle_auth_user(self, tg_user: TgUser, message: Message) -> Reply:
         """
         Handle messages written by the user in the Bot's chat.
 
         Args:
             tg_user (TgUser): The Telegram user object.
             message (Message): Message object with chat_id and message text.
+        Returns:
+            Reply: A message to be sent back to the user.
         """
         if message.text.startswith('/'):  # check if message is command
-            match message.text:
+            command, _, args = message.text.partition(' ')
+            match command:
                 case '/goals':
-                    text = get_user_goals(tg_user.user.id)
+                    return get_user_goals(tg_user.user.id, args)
                 case '/create':
                     text = show_categories(
                         user_id=tg_user.user.id, chat_id=message.chat.id, users_data=self.users_data)
@@ -80,5 +143,8 @@ class Command(BaseCommand):
                 user_id=tg_user.user.id, chat_id=message.chat.id, message=message.text, users_data=self.users_data
             )
         else:
-            text = 'List of commands:\n/goals - Show your goals\n' '/create - Create a goal\n/cancel - Cancel to create'
-        self.client.send_message(chat_id=message.chat.id, text=text)
+            text = (
+                'List of commands:\n/goals [status] [priority] - Show your goals, e.g. /goals done high\n'
+                '/create - Create a goal\n/cancel - Cancel to create'
+            )
+        return Reply(text)
@@ -0,0 +1,59 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from bot.models import TgOutboxMessage
+from bot.tg.client import TgClient
+from config.settings import TG_POOL_SIZE, TG_RETRIES, TG_TIMEOUT, TOKEN_BOT
+
+
+class Command(BaseCommand):
+    help = 'Send the Telegram messages queued in the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Messages taken at a time')
+        parser.add_argument('--max-attempts', type=int, default=8, help='Attempts before a message is given up')
+        parser.add_argument(
+            '--lease', type=float, default=300, help='Seconds before a taken but unsent message is taken again'
+        )
+        parser.add_argument('--sleep', type=float, default=1, help='Seconds to wait when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Exit when no message is due')
+
+    def handle(self, *args, **options):
+        client = TgClient(TOKEN_BOT, pool_size=TG_POOL_SIZE, timeout=TG_TIMEOUT, retries=TG_RETRIES)
+        lease = timedelta(seconds=options['lease'])
+        try:
+            while True:
+                batch = TgOutboxMessage.lease(options['batch_size'], lease)
+                if batch:
+                    self.send_batch(client, batch, options['max_attempts'])
+                elif options['once']:
+                    return
+                else:
+                    time.sleep(options['sleep'])
+        finally:
+            client.close()
+
+    def send_batch(self, client: TgClient, batch: list[TgOutboxMessage], max_attempts: int) -> None:
+        sent = failed = 0
+        for message in batch:
+            # Retries may outlast the lease, then the rest of the batch is due again for another worker.
+            # The first message goes out anyway, so even a lease shorter than one send makes progress
+            if (sent or failed) and timezone.now() >= message.next_attempt:
+                self.stdout.write(f'Outbox: lease expired, {len(batch) - sent - failed} messages left')
+                break
+            try:
+                response = client.send_message(chat_id=message.chat_id, text=message.text)
+                error = None if response is not None else 'Telegram did not accept the message'
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            if error is None:
+                # Marked at once, so the message is not sent again if the lease runs out later in the batch
+                TgOutboxMessage.mark_sent([message])
+                sent += 1
+            else:
+                message.mark_failed(error, max_attempts)
+                failed += 1
+        self.stdout.write(f'Outbox: {sent} sent, {failed} failed')
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.2 on 2026-10-18 17:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TgOutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chat_id', models.BigIntegerField(verbose_name='Telegram Chat Id')),
+                ('text', models.TextField(verbose_name='Text')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('next_attempt', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True, verbose_name='Next Attempt')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('sent', models.DateTimeField(blank=True, null=True, verbose_name='Sent')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last Error')),
+            ],
+            options={
+                'verbose_name': 'Telegram Outbox Message',
+                'verbose_name_plural': 'Telegram Outbox Messages',
+                'indexes': [models.Index(condition=models.Q(('next_attempt__isnull', False), ('sent__isnull', True)), fields=['next_attempt'], name='tgoutbox_pending_idx')],
+            },
+        ),
+    ]
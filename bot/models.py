@@ -1,4 +1,9 @@
-from django.db import models
+import random
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
 from core.models import User
 
@@ -22,3 +27,69 @@ class TgUser(models.Model):
 
     def __str__(self):
         return f'User chat id: {self.tg_id}'
+
+
+class TgOutboxMessage(models.Model):
+    """
+    Telegram message queued in the transaction of an API request and sent by the `send_tg_outbox` worker.
+
+    A message is sent at least once: the worker leases a batch by moving `next_attempt` forward,
+    sends it outside the transaction and marks every message as soon as it is sent, the failed ones are
+    retried with exponential backoff until `max_attempts`, after which `next_attempt` is cleared.
+    """
+
+    class Meta:
+        verbose_name = 'Telegram Outbox Message'
+        verbose_name_plural = 'Telegram Outbox Messages'
+        indexes = [
+            models.Index(
+                fields=['next_attempt'], condition=Q(sent__isnull=True, next_attempt__isnull=False),
+                name='tgoutbox_pending_idx',
+            ),
+        ]
+
+    chat_id = models.BigIntegerField(verbose_name='Telegram Chat Id')
+    text = models.TextField(verbose_name='Text')
+    created = models.DateTimeField(verbose_name='Created', auto_now_add=True)
+    next_attempt = models.DateTimeField(verbose_name='Next Attempt', default=timezone.now, null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(verbose_name='Attempts', default=0)
+    sent = models.DateTimeField(verbose_name='Sent', null=True, blank=True)
+    last_error = models.TextField(verbose_name='Last Error', blank=True)
+
+    def __str__(self):
+        return f'Message to chat id: {self.chat_id}'
+
+    @classmethod
+    def lease(cls, batch_size: int, lease: timedelta) -> list['TgOutboxMessage']:
+        """
+        Take up to `batch_size` due messages for `lease`, after which another worker may take them again.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(sent__isnull=True, next_attempt__lte=now)
+                .order_by('next_attempt')[:batch_size]
+            )
+            cls.objects.filter(pk__in=[message.pk for message in batch]).update(
+                next_attempt=now + lease, attempts=F('attempts') + 1
+            )
+        for message in batch:
+            message.attempts += 1
+            message.next_attempt = now + lease
+        return batch
+
+    @classmethod
+    def mark_sent(cls, messages: list['TgOutboxMessage']) -> None:
+        cls.objects.filter(pk__in=[message.pk for message in messages]).update(
+            sent=timezone.now(), next_attempt=None
+        )
+
+    def mark_failed(self, error: str, max_attempts: int, backoff: float = 5, max_backoff: float = 3600) -> None:
+        if self.attempts >= max_attempts:
+            self.next_attempt = None
+        else:
+            delay = random.uniform(0, min(max_backoff, backoff * 2 ** self.attempts))
+            self.next_attempt = timezone.now() + timedelta(seconds=delay)
+        self.last_error = error
+        self.save(update_fields=['next_attempt', 'last_error'])
@@ -1,58 +1,113 @@
+import re
 from collections import namedtuple
 
 from django.db import IntegrityError
+from django.db.models import F
 
+from bot.tg.dispatcher import MAX_MESSAGE_LENGTH
 from goals.models import BoardParticipant, Goal, GoalCategory
-from goals.serializers import CategorySerializer, GoalSerializer
+from goals.serializers import CategorySerializer
 
-GoalData = namedtuple('GoalData', ['title', 'due_date', 'priority', 'status'])
 CategoryData = namedtuple('CategoryData', ['cat_id', 'title'])
+Reply = namedtuple('Reply', ['text', 'reply_markup'], defaults=[None])
 
+# Goals read for one /goals message, fewer are shown if they do not fit in it
+GOALS_PAGE_SIZE = 50
+GOALS_CALLBACK_PREFIX = 'goals'
+# `goals:<offset>:<status digits>:<priority digits>`, ASCII digits only
+GOALS_CALLBACK_RE = re.compile(rf'{GOALS_CALLBACK_PREFIX}:([0-9]{{1,9}}):([0-9]*):([0-9]*)')
 
-def get_user_goals(user_id: int) -> str:
+
+def get_user_goals(user_id: int, args: str = '') -> Reply:
     """
-    Get user goals, filter it by main fields and return it to User Chat
+    Get the first page of user goals, filtered by the status and priority names in `args`, e.g. `done high`.
 
     Args:
         user_id (int): User ID
+        args (str): Arguments of the /goals command
     Returns:
-        str: A message with goals to be sent back to the user.
+        Reply: A message with goals to be sent back to the user.
     """
-    priority = dict(Goal.Priority.choices)
-    status = dict(Goal.Status.choices)
+    statuses, priorities = [], []
+    for arg in args.lower().split():
+        if arg in Goal.Status.names:
+            statuses.append(Goal.Status[arg].value)
+        elif arg in Goal.Priority.names:
+            priorities.append(Goal.Priority[arg].value)
+        else:
+            return Reply(
+                f'Unknown filter "{arg}".\nStatuses: {", ".join(Goal.Status.names)}\n'
+                f'Priorities: {", ".join(Goal.Priority.names)}'
+            )
+    return render_goals_page(user_id, statuses, priorities, offset=0)
 
-    goals = (
-        Goal.objects.select_related('user')
-        .filter(category__board__participants__user_id=user_id, category__is_deleted=False)
-        .exclude(status=Goal.Status.archived)
-        .all()
-    )
 
-    if not goals.exists():
-        return "You don't have any goals."
+def get_goals_page(user_id: int, data: str) -> Reply | None:
+    """
+    Get the page of user goals asked for by a "Next page" button.
+
+    Args:
+        user_id (int): User ID
+        data (str): Callback data of the button
+    Returns:
+        Reply | None: A message with goals, None if the data is not of a goals page.
+    """
+    match = GOALS_CALLBACK_RE.fullmatch(data)
+    if match is None:
+        return None
+    offset, statuses, priorities = match.groups()
+    # Statuses and priorities are single digits
+    statuses, priorities = list(map(int, statuses)), list(map(int, priorities))
+    if not set(statuses) <= set(Goal.Status.values) or not set(priorities) <= set(Goal.Priority.values):
+        return None
+    return render_goals_page(user_id, statuses, priorities, int(offset))
+
+
+def render_goals_page(user_id: int, statuses: list[int], priorities: list[int], offset: int) -> Reply:
+    """
+    Render the user goals from `offset` into one Telegram message.
 
-    serializer = GoalSerializer(goals, many=True)
+    Only the shown columns of at most `GOALS_PAGE_SIZE` goals are read. Lines are added while the message
+    fits in 4096 characters; if goals are left, the message gets a "Next page" button with the offset
+    and the filters packed into its callback data.
+    """
+    priority = dict(Goal.Priority.choices)
+    status = dict(Goal.Status.choices)
 
-    data = []
-    for item in serializer.data:
-        filtered_dict = GoalData(
-            title=item['title'],
-            due_date=item['due_date'][:10] if item['due_date'] else '',
-            priority=priority[item['priority']],
-            status=status[item['status']],
-        )
-        data.append(filtered_dict)
+    goals = Goal.objects.filter(board__participants__user_id=user_id, category__is_deleted=False)
+    if statuses:
+        goals = goals.filter(status__in=statuses)
+    else:
+        goals = goals.exclude(status=Goal.Status.archived)
+    if priorities:
+        goals = goals.filter(priority__in=priorities)
+    # One row more tells if there is a next page
+    rows = list(
+        goals.order_by(F('due_date').asc(nulls_last=True), 'pk')
+        .values_list('title', 'due_date', 'status', 'priority')[offset:offset + GOALS_PAGE_SIZE + 1]
+    )
 
-    message = []
-    for index, item in enumerate(data, start=1):
+    message, length = [], -1
+    for index, (title, due_date, goal_status, goal_priority) in enumerate(rows[:GOALS_PAGE_SIZE], start=offset + 1):
         goal = (
-            f'{index}) {item.title}, status: {item.status}, priority: {item.priority}, '
-            f"{'due_date: ' + item.due_date if item.due_date else ''}"
+            f'{index}) {title}, status: {status[goal_status]}, priority: {priority[goal_priority]}, '
+            f"{'due_date: ' + due_date.isoformat() if due_date else ''}"
         )
+        if message and length + 1 + len(goal) > MAX_MESSAGE_LENGTH:
+            break
         message.append(goal)
-
-    response = '\n'.join(message)
-    return response
+        length += 1 + len(goal)
+
+    if not message:
+        return Reply("You don't have any goals." if offset == 0 else 'There are no more goals.')
+    if len(message) == len(rows):
+        return Reply('\n'.join(message))
+
+    data = ':'.join([
+        GOALS_CALLBACK_PREFIX, str(offset + len(message)), ''.join(map(str, statuses)), ''.join(map(str, priorities))
+    ])
+    reply_markup = {'inline_keyboard': [[{'text': 'Next page', 'callback_data': data}]]}
+    return Reply('\n'.join(message), reply_markup)
 
 
 def show_categories(user_id: int, chat_id: int, users_data: dict[int, dict[str | int, ...]]) -> str:
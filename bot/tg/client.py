@@ -1,7 +1,11 @@
 import logging
+import random
+import time
 from typing import Type, TypeVar
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from pydantic.error_wrappers import ValidationError
 from pydantic.main import BaseModel
 
@@ -13,38 +17,163 @@ logger = logging.getLogger(__name__)
 
 
 class TgClient:
-    def __init__(self, token: str):
+    """
+    Telegram Bot API client on a pooled `requests.Session`.
+
+    Connections are kept alive between calls, up to `pool_size` of them. Network errors, 429 and 5xx responses
+    are retried up to `retries` times with exponential backoff and full jitter, waiting the `retry_after`
+    Telegram asks for instead when it gives one. Read timeouts are retried only for idempotent calls,
+    so a message that reached Telegram is not sent twice.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        pool_size: int = 10,
+        timeout: float = 10,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        api_url: str = 'https://api.telegram.org',
+    ):
         self.__token = token
-        self.__url = f'https://api.telegram.org/bot{self.__token}/'
+        self.__url = f'{api_url}/bot{self.__token}/'
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
     def __get_url(self, method: str):
         return f'{self.__url}{method}'
 
+    def close(self) -> None:
+        self.session.close()
+
     def get_updates(self, offset: int = 0, timeout: int = 30) -> GetUpdatesResponse:
-        url = self.__get_url('getUpdates')
-        response = requests.get(url, params={
-                                'timeout': timeout, 'offset': offset, 'allowed_updates': ['message']})
+        # The long poll holds the response for up to `timeout` seconds
+        response = self.__post(
+            'getUpdates',
+            {'timeout': timeout, 'offset': offset, 'allowed_updates': ['message', 'callback_query']},
+            timeout=(self.timeout, timeout + self.timeout),
+            idempotent=True,
+        )
 
         if response.ok:
             data = response.json()
-            return self.__deserialize_response(GetUpdatesResponse, data)
+            return deserialize_response(GetUpdatesResponse, data)
         else:
-            logger.error(f'Bad request getUpdates, ', response.status_code)
+            logger.error('Bad request getUpdates, %s', response.status_code)
 
-    def send_message(self, chat_id: int, text: str, timeout: int = 10) -> SendMessageResponse:
-        url = self.__get_url('sendMessage')
-        response = requests.get(
-            url, params={'timeout': timeout, 'chat_id': chat_id, 'text': text})
+    def send_message(
+        self, chat_id: int, text: str, reply_markup: dict | None = None, timeout: float | None = None
+    ) -> SendMessageResponse:
+        payload = {'chat_id': chat_id, 'text': text}
+        if reply_markup is not None:
+            payload['reply_markup'] = reply_markup
+        response = self.__post('sendMessage', payload, timeout=timeout or self.timeout)
 
         if response.ok:
             data = response.json()
-            return self.__deserialize_response(SendMessageResponse, data)
+            return deserialize_response(SendMessageResponse, data)
         else:
-            logger.warning(f'Bad request sendMessage, ', response.status_code)
+            logger.warning('Bad request sendMessage, %s', response.status_code)
+
+    def answer_callback_query(self, callback_query_id: str) -> bool:
+        """Stop the progress indicator of a pressed inline button."""
+        response = self.__post('answerCallbackQuery', {'callback_query_id': callback_query_id}, timeout=self.timeout)
+        if not response.ok:
+            logger.warning('Bad request answerCallbackQuery, %s', response.status_code)
+        return response.ok
+
+    def __post(
+        self, method: str, payload: dict, timeout: float | tuple[float, float], idempotent: bool = False
+    ) -> requests.Response:
+        """
+        POST the JSON payload, retrying the failures that may pass.
 
-    @staticmethod
-    def __deserialize_response(serializer_class: Type[T], data: dict) -> T:
+        Returns:
+            requests.Response: The first response that is not worth retrying, or the last one
+        Raises:
+            requests.RequestException: If the last attempt failed without a response
+        """
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = self.session.post(self.__get_url(method), json=payload, timeout=timeout)
+            except requests.ReadTimeout:
+                if not idempotent or last_attempt:
+                    raise
+                error, delay = 'read timeout', self.get_backoff(attempt)
+            except requests.ConnectionError as e:
+                if last_attempt:
+                    raise
+                error, delay = e, self.get_backoff(attempt)
+            else:
+                if last_attempt or (response.status_code != 429 and response.status_code < 500):
+                    return response
+                error, delay = response.status_code, self.get_retry_delay(response, attempt)
+            logger.warning(f'{method} failed ({error}), retry in {delay:.2f} s')
+            time.sleep(delay)
+
+    def get_backoff(self, attempt: int) -> float:
+        """Full jitter: a random delay up to the exponentially growing cap."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get_retry_delay(self, response: requests.Response, attempt: int) -> float:
         try:
-            return serializer_class(**data)
-        except ValidationError:
-            logger.error(f'Failed to deserialize JSON response: {data}')
+            retry_after = response.json()['parameters']['retry_after']
+        except (ValueError, KeyError, TypeError):
+            retry_after = response.headers.get('Retry-After')
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            return self.get_backoff(attempt)
+
+
+class AsyncTgClient:
+    """
+    asyncio long-polling client of the async bot engine.
+
+    Requests go through one `httpx.AsyncClient`, so connections to the API are kept alive,
+    at most `max_connections` at a time. Replies are not sent from here but by the `OutboundDispatcher`,
+    which keeps them within the Telegram rate limits.
+    """
+
+    def __init__(self, token: str, max_connections: int = 100, timeout: float = 10):
+        self.__timeout = timeout
+        self.__client = httpx.AsyncClient(
+            base_url=f'https://api.telegram.org/bot{token}/',
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+        )
+
+    async def __aenter__(self) -> 'AsyncTgClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.__client.aclose()
+
+    async def get_updates(self, offset: int = 0, timeout: int = 30) -> GetUpdatesResponse | None:
+        # The long poll holds the response for up to `timeout` seconds
+        response = await self.__client.post(
+            'getUpdates',
+            json={'timeout': timeout, 'offset': offset, 'allowed_updates': ['message', 'callback_query']},
+            timeout=httpx.Timeout(self.__timeout, read=timeout + self.__timeout),
+        )
+        if response.is_success:
+            return deserialize_response(GetUpdatesResponse, response.json())
+        logger.error('Bad request getUpdates, %s', response.status_code)
+
+
+def deserialize_response(serializer_class: Type[T], data: dict) -> T | None:
+    try:
+        return serializer_class(**data)
+    except ValidationError:
+        logger.error(f'Failed to deserialize JSON response: {data}')
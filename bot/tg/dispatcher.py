@@ -0,0 +1,236 @@
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from bot.tg.client import TgClient
+
+logger = logging.getLogger(__name__)
+
+# Longest text of one Telegram message
+MAX_MESSAGE_LENGTH = 4096
+
+
+class Lane(IntEnum):
+    """Priority lanes of outbound messages, lower goes first."""
+
+    urgent = 0
+    normal = 1
+
+
+class TokenBucket:
+    """`rate` tokens per second, at most `capacity` saved up."""
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def get_delay(self, now: float) -> float:
+        """Seconds until a token is available, 0 if it is now."""
+        self.refill(now)
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self.refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        self.refill(now)
+        return self.tokens >= self.capacity
+
+
+@dataclass
+class OutboundMessage:
+    chat_id: int
+    text: str
+    lane: Lane
+    enqueued: float
+    reply_markup: dict | None = None
+    parts: int = 1
+
+
+@dataclass
+class DispatcherMetrics:
+    submitted: int = 0
+    coalesced: int = 0
+    sent: int = 0
+    failed: int = 0
+    max_depth: int = 0
+    total_wait: float = 0
+    max_wait: float = 0
+    depth: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.sent if self.sent else 0
+
+
+class OutboundDispatcher:
+    """
+    Queue of the bot replies sent by background threads within Telegram's rate limits.
+
+    A message waits for a token of the global bucket (`global_rate` per second) and of its chat bucket
+    (`chat_rate` per second). Urgent lane messages, e.g. verification codes, go before normal ones.
+    Messages queued for a chat in the same lane are joined into one while they fit in a Telegram message,
+    so a burst to a chat takes one send instead of waiting for the chat limit message by message.
+    A chat has at most one message in flight, so its messages of a lane are sent in order.
+    """
+
+    def __init__(
+        self,
+        client: TgClient,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        senders: int = 8,
+        metrics_interval: float = 60,
+        clock=time.monotonic,
+    ):
+        self.client = client
+        self.chat_rate = chat_rate
+        self.senders = senders
+        self.metrics_interval = metrics_interval
+        self.clock = clock
+        self.condition = threading.Condition()
+        self.lanes: dict[Lane, OrderedDict[int, deque[OutboundMessage]]] = {lane: OrderedDict() for lane in Lane}
+        self.global_bucket = TokenBucket(global_rate, global_rate, clock())
+        self.chat_buckets: dict[int, TokenBucket] = {}
+        self.in_flight: set[int] = set()
+        self.depth = 0
+        self.metrics = DispatcherMetrics()
+        self.threads: list[threading.Thread] = []
+        self.closed = False
+        self.metrics_logged = clock()
+
+    def submit(self, chat_id: int, text: str, lane: Lane = Lane.normal, reply_markup: dict | None = None) -> None:
+        with self.condition:
+            now = self.clock()
+            queue = self.lanes[lane].setdefault(chat_id, deque())
+            self.metrics.submitted += 1
+            last = queue[-1] if queue else None
+            # A keyboard belongs to its own message
+            mergeable = last is not None and last.reply_markup is None and reply_markup is None
+            if mergeable and len(last.text) + 2 + len(text) <= MAX_MESSAGE_LENGTH:
+                last.text = f'{last.text}\n\n{text}'
+                last.parts += 1
+                self.metrics.coalesced += 1
+            else:
+                queue.append(
+                    OutboundMessage(chat_id=chat_id, text=text, lane=lane, enqueued=now, reply_markup=reply_markup)
+                )
+                self.depth += 1
+                self.metrics.max_depth = max(self.metrics.max_depth, self.depth)
+                self.condition.notify()
+
+    def get_metrics(self) -> DispatcherMetrics:
+        with self.condition:
+            self.metrics.depth = {
+                lane.name: sum(len(queue) for queue in self.lanes[lane].values()) for lane in Lane
+            }
+            return DispatcherMetrics(**vars(self.metrics))
+
+    def pop_ready(self, now: float) -> tuple[OutboundMessage | None, float | None]:
+        """
+        Take the first message of the highest lane that the rate limits let through now.
+
+        Must be called holding `condition`.
+
+        Returns:
+            tuple[OutboundMessage | None, float | None]: The message, or None and the seconds until one may be
+                ready (None if nothing is queued)
+        """
+        global_delay = self.global_bucket.get_delay(now)
+        wait = None
+        for lane in self.lanes.values():
+            for chat_id, queue in lane.items():
+                if chat_id in self.in_flight:
+                    continue
+                if global_delay:
+                    return None, global_delay
+                bucket = self.chat_buckets.get(chat_id)
+                delay = bucket.get_delay(now) if bucket is not None else 0
+                if delay:
+                    wait = delay if wait is None else min(wait, delay)
+                    continue
+
+                message = queue.popleft()
+                self.depth -= 1
+                if queue:
+                    # Round robin between the chats of the lane
+                    lane.move_to_end(chat_id)
+                else:
+                    del lane[chat_id]
+                self.global_bucket.take(now)
+                if bucket is None:
+                    bucket = self.chat_buckets[chat_id] = TokenBucket(self.chat_rate, 1, now)
+                bucket.take(now)
+                self.in_flight.add(chat_id)
+                return message, None
+        return None, wait
+
+    def start(self) -> None:
+        for index in range(self.senders):
+            thread = threading.Thread(target=self.run_sender, name=f'tg-sender-{index}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Stop taking messages and wait for the queued ones to be sent."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def run_sender(self) -> None:
+        while True:
+            with self.condition:
+                while True:
+                    now = self.clock()
+                    message, wait = self.pop_ready(now)
+                    if message is not None:
+                        break
+                    if self.closed and wait is None and not self.in_flight:
+                        return
+                    # Idle buckets are as good as new ones
+                    self.chat_buckets = {
+                        chat_id: bucket for chat_id, bucket in self.chat_buckets.items() if not bucket.is_full(now)
+                    }
+                    self.condition.wait(wait)
+            self.send(message)
+
+    def send(self, message: OutboundMessage) -> None:
+        waited = self.clock() - message.enqueued
+        try:
+            response = self.client.send_message(
+                chat_id=message.chat_id, text=message.text, reply_markup=message.reply_markup
+            )
+        except Exception as e:
+            logger.error(f'Failed to send a message to chat {message.chat_id}: {e}')
+            response = None
+
+        with self.condition:
+            self.in_flight.discard(message.chat_id)
+            if response is None:
+                self.metrics.failed += 1
+            else:
+                self.metrics.sent += 1
+                self.metrics.total_wait += waited
+                self.metrics.max_wait = max(self.metrics.max_wait, waited)
+            self.condition.notify_all()
+            log_metrics = self.clock() - self.metrics_logged >= self.metrics_interval
+            if log_metrics:
+                self.metrics_logged = self.clock()
+        if log_metrics:
+            metrics = self.get_metrics()
+            logger.info(
+                f'Outbound messages: {metrics.sent} sent, {metrics.failed} failed, {metrics.coalesced} coalesced, '
+                f'queued {metrics.depth}, wait {metrics.average_wait:.2f} s average, {metrics.max_wait:.2f} s max'
+            )
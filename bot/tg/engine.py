@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+from bot.tg.client import AsyncTgClient
+from bot.tg.scheme import Update
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBotEngine:
+    """
+    Long-polling bot loop that answers the chats concurrently.
+
+    Every chat with pending updates (messages and inline button presses) has its own task draining its queue,
+    so the updates of a chat are answered in order while a slow chat does not hold up the others.
+    The `handler` is the synchronous ORM code of the bot: it runs in a pool of `workers` threads,
+    which also bounds the database connections, and queues its replies to the `OutboundDispatcher`.
+    At most `max_pending` updates wait to be handled, beyond that polling pauses.
+    """
+
+    def __init__(
+        self,
+        client: AsyncTgClient,
+        handler: Callable[[Update], None],
+        workers: int = 16,
+        max_pending: int = 10000,
+        poll_timeout: int = 30,
+        error_delay: float = 1,
+    ):
+        self.client = client
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self.poll_timeout = poll_timeout
+        self.error_delay = error_delay
+        self.queues: dict[int, deque[Update]] = {}
+        self.tasks: set[asyncio.Task] = set()
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """
+        Poll and handle the updates until `stop` is set, then wait for the queued ones.
+        """
+        self.pending = asyncio.Semaphore(self.max_pending)
+        offset = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tg-handler') as self.executor:
+            try:
+                while stop is None or not stop.is_set():
+                    try:
+                        response = await self.client.get_updates(offset=offset, timeout=self.poll_timeout)
+                    except Exception as e:
+                        logger.error(f'getUpdates failed: {e}')
+                        response = None
+                    if response is None:
+                        await asyncio.sleep(self.error_delay)
+                        continue
+                    for update in response.result:
+                        offset = update.update_id + 1
+                        if update.chat_id is None:
+                            continue
+                        await self.pending.acquire()
+                        self.dispatch(update)
+            finally:
+                await asyncio.gather(*self.tasks)
+
+    def dispatch(self, update: Update) -> None:
+        """
+        Queue the update for its chat, starting the chat task if the chat has nothing queued.
+        """
+        chat_id = update.chat_id
+        queue = self.queues.get(chat_id)
+        if queue is None:
+            queue = self.queues[chat_id] = deque()
+            task = asyncio.create_task(self.process_chat(chat_id, queue))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        queue.append(update)
+
+    async def process_chat(self, chat_id: int, queue: deque[Update]) -> None:
+        loop = asyncio.get_running_loop()
+        # Checking the queue and dropping it happen without a switch, so no dispatched update is missed
+        while queue:
+            update = queue.popleft()
+            try:
+                await loop.run_in_executor(self.executor, self.handle, update)
+            except Exception:
+                logger.exception(f'Failed to handle an update of chat {chat_id}')
+            finally:
+                self.pending.release()
+        del self.queues[chat_id]
+
+    def handle(self, update: Update) -> None:
+        # Runs in a worker thread with its own database connection
+        close_old_connections()
+        try:
+            self.handler(update)
+        finally:
+            close_old_connections()
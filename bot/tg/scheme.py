@@ -12,9 +12,21 @@ class Message(BaseModel):
     text: str
 
 
+class CallbackQuery(BaseModel):
+    id: str
+    message: Message | None = None
+    data: str | None = None
+
+
 class Update(BaseModel):
     update_id: int
-    message: Message
+    message: Message | None = None
+    callback_query: CallbackQuery | None = None
+
+    @property
+    def chat_id(self) -> int | None:
+        message = self.message or self.callback_query and self.callback_query.message
+        return message.chat.id if message else None
 
 
 class GetUpdatesResponse(BaseModel):
@@ -1,11 +1,10 @@
+from django.db import transaction
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from bot.models import TgUser
+from bot.models import TgOutboxMessage, TgUser
 from bot.serializers import VerificationSerializer
-from bot.tg.client import TgClient
-from config.settings import TOKEN_BOT
 
 
 class VerificationView(APIView):
@@ -21,8 +20,11 @@ class VerificationView(APIView):
             tg_user = TgUser.objects.filter(
                 verification_code=verification_code).first()
             if tg_user:
-                tg_user.user_id = request.user.id
-                tg_user.save()
+                # The message is sent by the `send_tg_outbox` worker if the verification is committed
+                with transaction.atomic():
+                    tg_user.user_id = request.user.id
+                    tg_user.save()
+                    TgOutboxMessage.objects.create(chat_id=tg_user.tg_id, text='You are successfully verified!')
 
                 response_data = {
                     'tg_id': tg_user.tg_id,
@@ -31,10 +33,6 @@ class VerificationView(APIView):
                     'user_id': tg_user.user_id,
                 }
 
-                client = TgClient(TOKEN_BOT)
-                client.send_message(chat_id=tg_user.tg_id,
-                                    text='You are successfully verified!')
-
                 return Response(response_data, status=status.HTTP_200_OK)
             else:
                 return Response('Telegram user not found', status=status.HTTP_400_BAD_REQUEST)
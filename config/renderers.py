@@ -0,0 +1,33 @@
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    `JSONRenderer` that encodes with orjson when it is installed.
+
+    Dicts, lists, strings, numbers and dates are encoded natively. Datetimes and everything orjson
+    does not know (decimals, lazy strings, querysets, ...) go through the DRF encoder, so the output
+    keeps the format of the stdlib renderer. Indented output, values orjson can not encode
+    (e.g. integers over 64 bits) and a missing orjson fall back to the stdlib renderer.
+    """
+
+    options = 0 if orjson is None else orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Line and paragraph separators are valid JSON but not valid JavaScript, escape them as DRF does
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
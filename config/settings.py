@@ -13,6 +13,14 @@ DEBUG = bool(os.getenv('DEBUG', 0))
 
 TOKEN_BOT = os.getenv('TOKEN_BOT')
 
+# Connections kept alive to the Telegram API, request timeout (seconds) and retries of failed requests
+TG_POOL_SIZE = int(os.getenv('TG_POOL_SIZE', 10))
+TG_TIMEOUT = float(os.getenv('TG_TIMEOUT', 10))
+TG_RETRIES = int(os.getenv('TG_RETRIES', 3))
+# Telegram's limits of messages per second sent by the bot in total and to one chat
+TG_GLOBAL_RATE = float(os.getenv('TG_GLOBAL_RATE', 30))
+TG_CHAT_RATE = float(os.getenv('TG_CHAT_RATE', 1))
+
 ALLOWED_HOSTS = ['*']
 
 INSTALLED_APPS = [
@@ -22,6 +30,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'rest_framework',
     'django_filters',
@@ -35,7 +44,16 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
-
+    # orjson-backed JSON, falling back to the stdlib when orjson is not installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 AUTHENTICATION_BACKENDS = [
@@ -90,9 +108,35 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'postgres'),
         'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
         'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        'OPTIONS': {
+            # Threshold of the `%>` operator behind typo-tolerant (?fuzzy=true) title search
+            'options': f"-c pg_trgm.word_similarity_threshold={os.getenv('TRIGRAM_SIMILARITY_THRESHOLD', '0.5')}",
+        },
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
     }
 }
 
+# The board roles and the list responses are cached across requests only in a cache shared by all the workers,
+# e.g. Redis or Memcached (`CACHE_BACKEND`, `CACHE_LOCATION`): a `LocMemCache` could not be invalidated everywhere
+
+# Cache alias and lifetime (seconds) of the users' board memberships
+BOARD_ROLES_CACHE = os.getenv('BOARD_ROLES_CACHE', 'default')
+BOARD_ROLES_CACHE_TTL = int(os.getenv('BOARD_ROLES_CACHE_TTL', 300))
+
+# Cache alias and lifetime (seconds) of the board and category list responses
+LIST_CACHE = os.getenv('LIST_CACHE', 'default')
+LIST_CACHE_TTL = int(os.getenv('LIST_CACHE_TTL', 300))
+
+# Archive the goals of deleted boards and categories by the `run_cascades` worker instead of in the request
+DEFERRED_CASCADE = os.getenv('DEFERRED_CASCADE', '').lower() in ('1', 'true', 'yes')
+CASCADE_BATCH_SIZE = int(os.getenv('CASCADE_BATCH_SIZE', 1000))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from goals.models import GoalCategory, Goal, GoalComment
+from goals.models import CascadeJob, GoalCategory, Goal, GoalComment
 
 
 class GoalCategoryAdmin(admin.ModelAdmin):
@@ -15,8 +15,13 @@ class GoalCommentAdmin(admin.ModelAdmin):
     list_display = ('user', 'goal', 'created', 'updated')
     search_fields = ('user', 'goal')
 
+class CascadeJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'board', 'category', 'total', 'processed', 'created', 'finished')
+    readonly_fields = ('board', 'category', 'total', 'processed', 'finished')
+
 
 
 admin.site.register(GoalCategory, GoalCategoryAdmin)
 admin.site.register(Goal, GoalAdmin)
 admin.site.register(GoalComment, GoalCommentAdmin)
+admin.site.register(CascadeJob, CascadeJobAdmin)
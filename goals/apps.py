@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GoalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'goals'
+
+    def ready(self):
+        # Keep the cached board roles and lists in step with changes made anywhere, e.g. in the admin
+        from goals import signals  # noqa: F401
@@ -0,0 +1,123 @@
+import hashlib
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.http import parse_http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def get_shared_cache(alias: str) -> BaseCache | None:
+    """
+    Return the cache of the alias if it is shared by all the processes of the site.
+
+    A `LocMemCache` lives in one worker process: an entry dropped or bumped by a write in one worker
+    stays in the others, so data that must be invalidated is not cached there across requests at all.
+
+    Returns:
+        BaseCache | None: The cache, None if it is local to the process
+    """
+    cache = caches[alias]
+    return None if isinstance(cache, LocMemCache) else cache
+
+
+def _generation_key(user_id: int) -> str:
+    return f'goals:list_generation:{user_id}'
+
+
+def get_list_generation(user_id: int) -> int:
+    """
+    Return the generation of the user's cached lists.
+
+    A missing generation starts from the current time in nanoseconds rather than from zero,
+    so a counter evicted from the cache never comes back to a value used before.
+
+    Args:
+        user_id (int): User ID
+    Returns:
+        int: Current generation
+    """
+    cache = caches[settings.LIST_CACHE]
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_list_generations(user_ids: Iterable[int]) -> None:
+    """
+    Make the cached board and category lists of the users stale.
+
+    Cached responses are keyed by the generation, so bumping it is enough: old entries
+    are never read again and expire on their own.
+
+    Args:
+        user_ids (Iterable[int]): IDs of the users whose boards or categories were changed
+    """
+    keys = [_generation_key(user_id) for user_id in set(user_ids)]
+    cache = get_shared_cache(settings.LIST_CACHE)
+    if not keys or cache is None:
+        return
+
+    def bump():
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Nothing was cached under this generation yet
+                pass
+
+    bump()
+    # A concurrent request may cache the old data under the new generation before the change is committed
+    transaction.on_commit(bump)
+
+
+class CachedListMixin:
+    """
+    List view mixin that caches response data per user and query string.
+
+    Keys include the user's list generation, which `bump_list_generations` moves on every write
+    to the user's boards, memberships or categories. The validators of `ConditionalGetMixin`
+    are cached with the data, so a cache hit may also answer 304 without touching the database.
+    Nothing is cached unless `LIST_CACHE` is shared by all the processes, see `get_shared_cache`.
+    """
+
+    def get_list_cache_key(self, request: Request) -> str:
+        query = f'{request.get_full_path()}|{request.accepted_media_type}'
+        return 'goals:list:{}:{}:{}:{}'.format(
+            type(self).__name__,
+            request.user.pk,
+            get_list_generation(request.user.pk),
+            hashlib.md5(query.encode(), usedforsecurity=False).hexdigest(),
+        )
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        cache = get_shared_cache(settings.LIST_CACHE)
+        if cache is None:
+            return super().list(request, *args, **kwargs)
+        key = self.get_list_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            data, headers = cached
+            response = Response(data)
+            for header, value in headers.items():
+                response[header] = value
+            if 'ETag' in headers and hasattr(self, 'conditional_response'):
+                last_modified = headers.get('Last-Modified')
+                if last_modified is not None:
+                    last_modified = datetime.fromtimestamp(parse_http_date(last_modified), tz=timezone.utc)
+                return self.conditional_response(request, headers['ETag'], last_modified) or response
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {header: response[header] for header in ('ETag', 'Last-Modified') if response.has_header(header)}
+            cache.set(key, (response.data, headers), settings.LIST_CACHE_TTL)
+        return response
@@ -0,0 +1,98 @@
+import csv
+import datetime
+import json
+from collections.abc import Iterable, Iterator
+
+from django.db.models import Model, QuerySet
+
+from goals.models import Goal, GoalCategory, GoalComment
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Exported fields of every row type, in output order
+EXPORT_FIELDS: dict[str, tuple[str, ...]] = {
+    'category': ('id', 'title', 'user', 'is_deleted', 'created', 'updated'),
+    'goal': ('id', 'category', 'title', 'description', 'due_date', 'status', 'priority', 'user', 'created', 'updated'),
+    'comment': ('id', 'goal', 'text', 'user', 'created', 'updated'),
+}
+CSV_COLUMNS: tuple[str, ...] = ('type', *dict.fromkeys(field for fields in EXPORT_FIELDS.values() for field in fields))
+
+
+def _export_value(value):
+    if isinstance(value, datetime.datetime):
+        value = value.astimezone(datetime.timezone.utc).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def _iter_rows(row_type: str, queryset: QuerySet, chunk_size: int) -> Iterator[dict]:
+    fields = EXPORT_FIELDS[row_type]
+    model: type[Model] = queryset.model
+    # `values_list('fk')` gives the related primary key
+    columns = [model._meta.get_field(field).attname for field in fields]
+    for values in queryset.order_by('pk').values_list(*columns).iterator(chunk_size=chunk_size):
+        row = {'type': row_type}
+        row.update(zip(fields, map(_export_value, values)))
+        yield row
+
+
+def iter_board_rows(
+    board_id: int, since: datetime.datetime | None = None, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[dict]:
+    """
+    Yield the categories, goals and comments of the board as flat rows.
+
+    Rows are read with server-side cursors `chunk_size` at a time, so memory does not grow with the board.
+
+    A full export leaves out what the API treats as deleted: deleted categories, archived goals (deleting
+    a goal archives it) and the goals and comments under them, so an export and import round trip brings
+    nothing deleted back. An incremental one (`since`) keeps them as tombstones, so a client can apply
+    deletions too: categories with `is_deleted`, archived goals and goals of deleted categories.
+    Deleted comments are removed from the database and can not be carried, only a full export drops them.
+
+    Args:
+        board_id (int): Board ID
+        since (datetime | None): Only export objects updated at or after this moment
+        chunk_size (int): Rows fetched from the database at a time
+    Returns:
+        Iterator[dict]: `{'type': ..., **EXPORT_FIELDS[type]}` rows, categories first, then goals, then comments
+    """
+    categories = GoalCategory.objects.filter(board_id=board_id)
+    goals = Goal.objects.filter(board_id=board_id)
+    comments = GoalComment.objects.filter(board_id=board_id, goal__category__is_deleted=False)
+    if since is None:
+        categories = categories.filter(is_deleted=False)
+        goals = goals.filter(category__is_deleted=False).exclude(status=Goal.Status.archived)
+        comments = comments.exclude(goal__status=Goal.Status.archived)
+    querysets = {'category': categories, 'goal': goals, 'comment': comments}
+    for row_type, queryset in querysets.items():
+        if since is not None:
+            queryset = queryset.filter(updated__gte=since)
+        yield from _iter_rows(row_type, queryset, chunk_size)
+
+
+def ndjson_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+class _Echo:
+    """File-like object that hands back what `csv.writer` writes."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_lines(rows: Iterable[dict]) -> Iterator[str]:
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_COLUMNS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_lines, 'application/x-ndjson'),
+    'csv': (csv_lines, 'text/csv'),
+}
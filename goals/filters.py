@@ -1,6 +1,13 @@
+import re
+
 import django_filters
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity, TrigramWordSimilarity
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
 from django_filters import rest_framework
+from rest_framework import filters
+from rest_framework.settings import api_settings
 
 from goals.models import Goal
 
@@ -17,4 +24,86 @@ class GoalDateFilter(rest_framework.FilterSet):
 
     filter_overrides = {
         models.DateTimeField: {"filter_class": django_filters.IsoDateTimeFilter},
-    }
\ No newline at end of file
+    }
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    `?search=` backed by a Postgres full-text index instead of `ILIKE '%term%'`.
+
+    Views opt in by naming their stored `search_vector_field`; every search word is matched as a prefix
+    (so results follow the user's typing) and, unless `?ordering=` is given, results are ranked by relevance.
+    Views without `search_vector_field` keep the stock `SearchFilter` behaviour.
+    """
+
+    search_config = 'russian'
+    word_re = re.compile(r'\w+')
+
+    def filter_queryset(self, request, queryset, view):
+        vector_field = getattr(view, 'search_vector_field', None)
+        terms = self.get_search_terms(request)
+        if not vector_field or not terms:
+            return super().filter_queryset(request, queryset, view)
+
+        words = [word for term in terms for word in self.word_re.findall(term)]
+        if not words:
+            return queryset.none()
+
+        query = SearchQuery(
+            ' & '.join(f'{word}:*' for word in words), config=self.search_config, search_type='raw'
+        )
+        queryset = queryset.filter(**{vector_field: query}).annotate(search_rank=SearchRank(F(vector_field), query))
+
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('-search_rank', '-id')
+        return queryset
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    `SearchFilter` for short title-like fields covered by `gin_trgm_ops` indexes.
+
+    By default it keeps the stock `icontains` matching, which Postgres serves from the trigram index.
+    With `?fuzzy=true` the search becomes typo-tolerant: rows are matched by trigram word similarity
+    and, unless `?ordering=` is given, sorted from the closest match.
+    """
+
+    fuzzy_param = 'fuzzy'
+    fuzzy_true_values = ('1', 'true', 'yes')
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        terms = self.get_search_terms(request)
+        fuzzy = request.query_params.get(self.fuzzy_param, '').lower() in self.fuzzy_true_values
+        if not fuzzy or not search_fields or not terms:
+            return super().filter_queryset(request, queryset, view)
+
+        value = ' '.join(terms)
+        field_names = [field.lstrip('^=@$') for field in search_fields]
+
+        condition = Q()
+        for name in field_names:
+            condition |= Q(**{f'{name}__trigram_word_similar': value})
+        queryset = queryset.filter(condition).annotate(
+            search_rank=self._greatest([TrigramWordSimilarity(value, name) for name in field_names]),
+            # Breaks ties between titles that contain an equally close word
+            search_similarity=self._greatest([TrigramSimilarity(name, value) for name in field_names]),
+        )
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('-search_rank', '-search_similarity', '-id')
+        return queryset
+
+    @staticmethod
+    def _greatest(expressions: list):
+        return expressions[0] if len(expressions) == 1 else Greatest(*expressions)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.fuzzy_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Typo-tolerant (trigram) search.',
+                'schema': {'type': 'boolean'},
+            },
+        ]
@@ -0,0 +1,252 @@
+import codecs
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.db import models, transaction
+from django.utils.dateparse import parse_date
+
+from goals.cache import bump_list_generations
+from goals.models import BoardGoalStats, Goal, GoalCategory
+
+IMPORT_BATCH_SIZE = 1000
+# Errors kept for the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+def iter_ndjson(lines: Iterable[bytes | str]) -> Iterator[tuple[int, dict]]:
+    """
+    Parse newline-delimited JSON objects one line at a time, skipping blank lines.
+
+    Lines that are not JSON objects are yielded as `{'__error__': message}` so the import can report them.
+
+    Returns:
+        Iterator[tuple[int, dict]]: Line number in the file and the object
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            # Decoding errors are ValueErrors too
+            row = json.loads(line.decode('utf-8') if isinstance(line, bytes) else line)
+        except ValueError as exc:
+            row = {'__error__': f'Invalid JSON: {exc}'}
+        yield number, row if isinstance(row, dict) else {'__error__': 'Expected a JSON object.'}
+
+
+def iter_csv(lines: Iterable[bytes | str]) -> Iterator[tuple[int, dict]]:
+    """
+    Parse CSV rows with a header line into dicts, decoding the input lazily and skipping blank lines.
+
+    Returns:
+        Iterator[tuple[int, dict]]: Line number in the file where the row starts and the row
+    """
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return
+    if isinstance(first, bytes):
+        decoded = codecs.iterdecode(_chain(first, lines), 'utf-8-sig')
+    else:
+        decoded = _chain(first, lines)
+    reader = csv.reader(decoded)
+    header = next(reader, None)
+    if header is None:
+        return
+    # A quoted value may span lines, so a row starts after the line where the previous one ended
+    start = reader.line_num + 1
+    for values in reader:
+        if values:
+            yield start, {key: value for key, value in zip(header, values) if value != ''}
+        start = reader.line_num + 1
+
+
+def _chain(first, rest: Iterator) -> Iterator:
+    yield first
+    yield from rest
+
+
+IMPORT_FORMATS = {
+    'ndjson': iter_ndjson,
+    'jsonl': iter_ndjson,
+    'csv': iter_csv,
+}
+
+
+@dataclass
+class ImportReport:
+    categories: int = 0
+    goals: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def add_error(self, line: int, errors) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+
+class GoalImporter:
+    """
+    Import categories and goals into a board from flat rows.
+
+    Rows are `{'type': 'category', 'title': ...}` or `{'type': 'goal', 'category': <category title>,
+    'title': ..., 'description', 'due_date', 'status', 'priority'}`; `type` defaults to `goal`.
+    Statuses and priorities are accepted as numbers or names (`done`, `high`).
+
+    Rows are taken `batch_size` at a time: category titles of a batch are resolved with one query,
+    missing categories and then the goals are created with `bulk_create`, all in a transaction per batch.
+    As in the API, a category title may not be taken by a category of another board or a deleted one.
+    Memory use is bounded by the batch size whatever the size of the input.
+    """
+
+    def __init__(self, board_id: int, user_id: int, batch_size: int = IMPORT_BATCH_SIZE):
+        self.board_id = board_id
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.report = ImportReport()
+
+    def run(self, rows: Iterable[tuple[int, dict]]) -> ImportReport:
+        """
+        Import the rows.
+
+        Args:
+            rows (Iterable[tuple[int, dict]]): Line numbers and rows, as yielded by `IMPORT_FORMATS` parsers
+        Returns:
+            ImportReport: Counts of the imported objects and the errors by line
+        """
+        batch = []
+        for line, row in rows:
+            batch.append((line, row))
+            if len(batch) >= self.batch_size:
+                self.import_batch(batch)
+                batch = []
+        if batch:
+            self.import_batch(batch)
+        return self.report
+
+    def import_batch(self, batch: list[tuple[int, dict]]) -> None:
+        rows = []
+        for line, row in batch:
+            try:
+                rows.append((line, *self.clean_row(row)))
+            except ValueError as exc:
+                self.report.add_error(line, exc.args[0])
+
+        with transaction.atomic():
+            categories = self.resolve_categories({category_title for _, _, category_title, _ in rows})
+            objects = []
+            for line, row_type, category_title, values in rows:
+                if category_title not in categories:
+                    field_name = 'title' if row_type == 'category' else 'category'
+                    self.report.add_error(line, {field_name: ['Category already exists.']})
+                elif row_type == 'goal':
+                    objects.append(Goal(
+                        **values, category_id=categories[category_title], user_id=self.user_id, board_id=self.board_id
+                    ))
+            Goal.objects.bulk_create(objects)
+            BoardGoalStats.record_changes((None, (goal.board_id, goal.status, goal.priority)) for goal in objects)
+        self.report.goals += len(objects)
+
+    def resolve_categories(self, titles: set[str]) -> dict[str, int]:
+        """
+        Map category titles of the board to IDs, creating the missing categories.
+
+        Titles taken by categories of other boards or deleted ones are left out of the map,
+        the check of `CategoryCreateSerializer` that `bulk_create` would skip.
+        """
+        categories, taken = {}, set()
+        existing = GoalCategory.objects.filter(title__in=titles).values_list('title', 'id', 'board_id', 'is_deleted')
+        for title, category_id, board_id, is_deleted in existing:
+            if board_id == self.board_id and not is_deleted:
+                categories[title] = category_id
+            else:
+                taken.add(title)
+        missing = [
+            GoalCategory(board_id=self.board_id, user_id=self.user_id, title=title)
+            for title in sorted(titles - categories.keys() - taken)
+        ]
+        GoalCategory.objects.bulk_create(missing)
+        if missing:
+            # `bulk_create` sends no signals
+            bump_list_generations([self.user_id])
+        self.report.categories += len(missing)
+        categories.update((category.title, category.id) for category in missing)
+        return categories
+
+    def clean_row(self, row: dict) -> tuple[str, str, dict]:
+        """
+        Validate a row.
+
+        Returns:
+            tuple[str, str, dict]: Row type, category title and the goal field values
+        Raises:
+            ValueError: With a `{field: [message]}` dict if the row is invalid
+        """
+        if '__error__' in row:
+            raise ValueError({'non_field_errors': [row['__error__']]})
+
+        row_type = row.get('type') or 'goal'
+        if row_type not in ('category', 'goal'):
+            raise ValueError({'type': ['Expected category or goal.']})
+        errors = {}
+
+        category_field = 'title' if row_type == 'category' else 'category'
+        category_title = self.clean_title(row.get(category_field), category_field, errors)
+        if row_type == 'category':
+            if errors:
+                raise ValueError(errors)
+            return row_type, category_title, {}
+
+        values = {
+            'title': self.clean_title(row.get('title'), 'title', errors),
+            'description': self.clean_description(row.get('description'), errors),
+            'due_date': self.clean_date(row.get('due_date'), errors),
+            'status': self.clean_choice(row.get('status'), Goal.Status, 'status', errors),
+            'priority': self.clean_choice(row.get('priority'), Goal.Priority, 'priority', errors),
+        }
+        if errors:
+            raise ValueError(errors)
+        return row_type, category_title, values
+
+    @staticmethod
+    def clean_title(value, name: str, errors: dict) -> str:
+        value = str(value).strip() if value is not None else ''
+        if not value:
+            errors[name] = ['This field is required.']
+        elif len(value) > 255:
+            errors[name] = ['Ensure this field has no more than 255 characters.']
+        return value
+
+    @staticmethod
+    def clean_description(value, errors: dict) -> str | None:
+        if value is None or isinstance(value, str):
+            return value or None
+        errors['description'] = ['Not a valid string.']
+        return None
+
+    @staticmethod
+    def clean_date(value, errors: dict) -> date | None:
+        if not value:
+            return None
+        try:
+            parsed = parse_date(str(value))
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            errors['due_date'] = ['Expected a YYYY-MM-DD date.']
+        return parsed
+
+    @staticmethod
+    def clean_choice(value, choices: type[models.IntegerChoices], name: str, errors: dict) -> int | None:
+        if value in (None, ''):
+            return Goal._meta.get_field(name).default
+        if isinstance(value, str) and value in choices.names:
+            return choices[value].value
+        try:
+            return choices(int(value)).value
+        except (TypeError, ValueError):
+            errors[name] = [f'Expected one of: {", ".join(choices.names)}.']
+            return None
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from goals.importer import IMPORT_BATCH_SIZE, IMPORT_FORMATS, GoalImporter
+from goals.models import Board
+
+
+class Command(BaseCommand):
+    help = 'Import categories and goals into a board from an NDJSON or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, "-" for stdin')
+        parser.add_argument('--board', type=int, required=True, help='Board ID')
+        parser.add_argument('--user', required=True, help='Username of the author of the imported objects')
+        parser.add_argument(
+            '--input', choices=sorted(IMPORT_FORMATS), help='File format, by default taken from the extension'
+        )
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Rows per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            board = Board.objects.get(pk=options['board'], is_deleted=False)
+        except Board.DoesNotExist:
+            raise CommandError(f'Board {options["board"]} does not exist')
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["user"]} does not exist')
+
+        path = options['path']
+        input_format = options['input'] or Path(path).suffix.lstrip('.').lower()
+        if input_format not in IMPORT_FORMATS:
+            raise CommandError('Unknown file format, pass --input')
+
+        importer = GoalImporter(board.pk, user.pk, batch_size=options['batch_size'])
+        if path == '-':
+            report = importer.run(IMPORT_FORMATS[input_format](sys.stdin.buffer))
+        else:
+            try:
+                with open(path, 'rb') as file:
+                    report = importer.run(IMPORT_FORMATS[input_format](file))
+            except OSError as e:
+                raise CommandError(f'Can not read {path}: {e}')
+
+        for error in report.errors:
+            self.stderr.write(f'Line {error["line"]}: {error["errors"]}')
+        self.stdout.write(
+            f'Imported {report.categories} categories and {report.goals} goals, {report.failed} lines failed'
+        )
@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from goals.models import CascadeJob
+
+
+class Command(BaseCommand):
+    help = 'Archive the goals of deleted boards and categories queued with DEFERRED_CASCADE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.CASCADE_BATCH_SIZE, help='Goals per transaction')
+        parser.add_argument('--sleep', type=float, default=5, help='Seconds to wait when there are no jobs')
+        parser.add_argument('--once', action='store_true', help='Exit when there are no jobs left')
+
+    def handle(self, *args, **options):
+        while True:
+            job = CascadeJob.run_next(options['batch_size'])
+            if job is not None:
+                state = 'finished' if job.finished else 'in progress'
+                self.stdout.write(f'Cascade job {job.pk}: {job.processed}/{job.total} goals archived, {state}')
+            elif options['once']:
+                return
+            else:
+                time.sleep(options['sleep'])
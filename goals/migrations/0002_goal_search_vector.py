@@ -0,0 +1,68 @@
+# Generated by Django 4.2.2 on 2026-10-18 16:44
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+from django.db import migrations
+from django.db.models import F
+
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_VECTOR_TRIGGER = '''
+CREATE FUNCTION goals_goal_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON goals_goal
+    FOR EACH ROW EXECUTE FUNCTION goals_goal_search_vector_update();
+'''
+
+DROP_SEARCH_VECTOR_TRIGGER = '''
+DROP TRIGGER IF EXISTS goals_goal_search_vector_trigger ON goals_goal;
+DROP FUNCTION IF EXISTS goals_goal_search_vector_update();
+'''
+
+
+def backfill_search_vector(apps, schema_editor):
+    Goal = apps.get_model('goals', 'Goal')
+    last_pk = 0
+    while True:
+        # Filled rows are skipped, so a migration stopped halfway resumes where it left off
+        pks = list(
+            Goal.objects.filter(pk__gt=last_pk, search_vector__isnull=True)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:BACKFILL_BATCH_SIZE]
+        )
+        if not pks:
+            break
+        # Rewriting the title fires the trigger that fills the vector
+        Goal.objects.filter(pk__in=pks).update(title=F('title'))
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_TRIGGER, DROP_SEARCH_VECTOR_TRIGGER),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goal',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='goal_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.2 on 2026-10-18 16:45
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0002_goal_search_vector'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='board',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='board_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goalcategory',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='goalcategory_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.2 on 2026-10-18 16:48
+
+import django.contrib.postgres.operations
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0003_title_trigram_indexes'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='boardparticipant',
+            index=models.Index(fields=['board', 'user', 'role'], name='participant_board_role_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='boardparticipant',
+            index=models.Index(fields=['user', 'board', 'role'], name='participant_user_role_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['user', 'status'], name='goal_user_active_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(fields=['category', 'status'], name='goal_category_status_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', 'title'], name='goalcategory_user_active_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['board'], name='goalcategory_board_active_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['goal', '-created'], name='goalcomment_goal_created_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['user', '-created'], name='goalcomment_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.2 on 2026-10-18 16:49
+
+import django.contrib.postgres.operations
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def backfill_board(apps, schema_editor):
+    Goal = apps.get_model('goals', 'Goal')
+    GoalCategory = apps.get_model('goals', 'GoalCategory')
+    GoalComment = apps.get_model('goals', 'GoalComment')
+
+    # Goals go first: comments copy the board from their already backfilled goal
+    sources = [
+        (Goal, Subquery(GoalCategory.objects.filter(pk=OuterRef('category_id')).values('board_id')[:1])),
+        (GoalComment, Subquery(Goal.objects.filter(pk=OuterRef('goal_id')).values('board_id')[:1])),
+    ]
+    for model, board_id in sources:
+        last_pk = 0
+        while True:
+            # Each batch is committed on its own to keep row locks short on a live table
+            pks = list(
+                model.objects.filter(pk__gt=last_pk, board__isnull=True)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:BACKFILL_BATCH_SIZE]
+            )
+            if not pks:
+                break
+            model.objects.filter(pk__in=pks).update(board_id=board_id)
+            last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='board',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='goals', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.AddField(
+            model_name='goalcomment',
+            name='board',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='comments', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.RunPython(backfill_board, migrations.RunPython.noop),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(fields=['board', 'status'], name='goal_board_status_idx'),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['board'], name='goalcomment_board_idx'),
+        ),
+    ]
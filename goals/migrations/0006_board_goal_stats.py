@@ -0,0 +1,66 @@
+# Generated by Django 4.2.2 on 2026-10-18 16:57
+
+import django.contrib.postgres.operations
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+BACKFILL_BATCH_SIZE = 5000
+STATUS_FIELDS = {1: 'status_to_do', 2: 'status_in_progress', 3: 'status_done', 4: 'status_archived'}
+PRIORITY_FIELDS = {1: 'priority_low', 2: 'priority_medium', 3: 'priority_high', 4: 'priority_critical'}
+ARCHIVED = 4
+
+
+def backfill_stats(apps, schema_editor):
+    Board = apps.get_model('goals', 'Board')
+    BoardGoalStats = apps.get_model('goals', 'BoardGoalStats')
+    Goal = apps.get_model('goals', 'Goal')
+
+    stats = {board_id: BoardGoalStats(board_id=board_id) for board_id in Board.objects.values_list('pk', flat=True)}
+    counts = Goal.objects.order_by().values('board_id', 'status', 'priority').annotate(count=Count('pk'))
+    for row in counts.iterator():
+        board_stats = stats.get(row['board_id'])
+        if board_stats is None:
+            continue
+        fields = [STATUS_FIELDS[row['status']]]
+        if row['status'] != ARCHIVED:
+            fields.append(PRIORITY_FIELDS[row['priority']])
+        for field in fields:
+            setattr(board_stats, field, getattr(board_stats, field) + row['count'])
+    # Rows already created by live writes were counted from the goals themselves
+    BoardGoalStats.objects.bulk_create(stats.values(), batch_size=BACKFILL_BATCH_SIZE, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0005_denormalized_board'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardGoalStats',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='goal_stats', serialize=False, to='goals.board', verbose_name='Доска')),
+                ('status_to_do', models.IntegerField(default=0, verbose_name='К выполнению')),
+                ('status_in_progress', models.IntegerField(default=0, verbose_name='В процессе')),
+                ('status_done', models.IntegerField(default=0, verbose_name='Выполнено')),
+                ('status_archived', models.IntegerField(default=0, verbose_name='Архив')),
+                ('priority_low', models.IntegerField(default=0, verbose_name='Низкий приоритет')),
+                ('priority_medium', models.IntegerField(default=0, verbose_name='Средний приоритет')),
+                ('priority_high', models.IntegerField(default=0, verbose_name='Высокий приоритет')),
+                ('priority_critical', models.IntegerField(default=0, verbose_name='Критический приоритет')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')),
+            ],
+            options={
+                'verbose_name': 'Статистика доски',
+                'verbose_name_plural': 'Статистика досок',
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status__in', [1, 2])), fields=['board', 'due_date'], name='goal_board_overdue_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.2 on 2026-10-18 17:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0006_board_goal_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CascadeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')),
+                ('total', models.PositiveIntegerField(blank=True, null=True, verbose_name='Целей к архивации')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Архивировано целей')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Дата завершения')),
+                ('board', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='goals.board', verbose_name='Доска')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='goals.goalcategory', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'Каскадное удаление',
+                'verbose_name_plural': 'Каскадные удаления',
+                'indexes': [models.Index(condition=models.Q(('finished__isnull', True)), fields=['id'], name='cascadejob_pending_idx')],
+            },
+        ),
+    ]
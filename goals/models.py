@@ -1,6 +1,14 @@
-from django.db import models
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
 
 from core.models import User
+from goals.cache import bump_list_generations
 
 
 class BaseModel(models.Model):
@@ -10,12 +18,21 @@ class BaseModel(models.Model):
     created = models.DateTimeField(verbose_name='Дата создания', auto_now_add=True)
     updated = models.DateTimeField(verbose_name='Дата последнего обновления', auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded column values to detect changes on save
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
 
 class Board(BaseModel):
     class Meta:
         verbose_name = 'Доска'
         verbose_name_plural = 'Доски'
+        indexes = [
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='board_title_trgm_idx'),
+        ]
 
     title = models.CharField(verbose_name='Название', max_length=255)
     is_deleted = models.BooleanField(verbose_name='Удалена', default=False)
@@ -23,12 +40,23 @@ class Board(BaseModel):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            BoardGoalStats.objects.create(board=self)
+
 
 class BoardParticipant(BaseModel):
     class Meta:
         unique_together = ('board', 'user')
         verbose_name = 'Участник'
         verbose_name_plural = 'Участники'
+        indexes = [
+            # Role checks by board and the per-user role map are answered by index-only scans
+            models.Index(fields=['board', 'user', 'role'], name='participant_board_role_idx'),
+            models.Index(fields=['user', 'board', 'role'], name='participant_user_role_idx'),
+        ]
 
     class Role(models.IntegerChoices):
         owner = 1, 'Владелец'
@@ -50,6 +78,11 @@ class GoalCategory(BaseModel):
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='goalcategory_title_trgm_idx'),
+            models.Index(fields=['user', 'title'], condition=Q(is_deleted=False), name='goalcategory_user_active_idx'),
+            models.Index(fields=['board'], condition=Q(is_deleted=False), name='goalcategory_board_active_idx'),
+        ]
 
 
     board = models.ForeignKey(Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='categories')
@@ -62,6 +95,64 @@ class GoalCategory(BaseModel):
         return self.title
 
 
+class GoalQuerySet(models.QuerySet):
+    def archive(self) -> int:
+        """
+        Move the goals to the archive with one `UPDATE`, keeping the board statistics in step.
+
+        Returns:
+            int: Number of archived goals
+        """
+        return self.exclude(status=Goal.Status.archived).update_goals(status=Goal.Status.archived)
+
+    def update_goals(self, **changes) -> int:
+        """
+        Set-based `update()` that also bumps `updated` and moves the goals between board statistics counters.
+
+        The matching rows are locked and counted by board, status and priority in one statement, then updated
+        through the same subquery, so no primary keys are taken to Python. The locked rows can not change
+        until the transaction ends, so the statistics move from the values the `UPDATE` replaces;
+        if a concurrent write made other goals of the boards match in between, the boards are recounted instead.
+        The statistics take one `UPDATE` per affected board whatever the number of goals.
+
+        Returns:
+            int: Number of updated goals
+        """
+        goals = Goal.objects.filter(pk__in=self.order_by().values('pk'))
+        with transaction.atomic(using=self.db):
+            locked = goals.order_by('pk').select_for_update(of=('self',)).values_list('board_id', 'status', 'priority')
+            sql, params = locked.query.sql_with_params()
+            with connections[self.db].cursor() as cursor:
+                # PostgreSQL takes no FOR UPDATE next to GROUP BY, the rows are locked in a subquery
+                cursor.execute(
+                    f'SELECT board_id, status, priority, COUNT(*) FROM ({sql}) AS locked GROUP BY 1, 2, 3', params
+                )
+                counts = cursor.fetchall()
+            if not counts:
+                return 0
+
+            deltas = defaultdict(Counter)
+            for *old, count in counts:
+                old = tuple(old)
+                new = tuple(changes.get(field, value) for field, value in zip(('board_id', 'status', 'priority'), old))
+                if old != new:
+                    BoardGoalStats.collect_change(deltas, old, new, count)
+
+            updated = goals.update(**changes, updated=timezone.now())
+            if updated == sum(count for *_, count in counts):
+                BoardGoalStats.apply(deltas)
+            else:
+                board_ids = {board_id for board_id, *_ in counts} | {changes.get('board_id')}
+                BoardGoalStats.refresh(board_id for board_id in board_ids if board_id is not None)
+        return updated
+
+
+class GoalManager(models.Manager.from_queryset(GoalQuerySet)):
+    def get_queryset(self):
+        # The search vector is maintained by a database trigger and only used inside SQL
+        return super().get_queryset().defer('search_vector')
+
+
 class Goal(BaseModel):
     class Status(models.IntegerChoices):
         to_do = 1, 'К выполнению'
@@ -84,20 +175,306 @@ class Goal(BaseModel):
         verbose_name='Приоритет', choices=Priority.choices, default=Priority.medium
     )
     category = models.ForeignKey(GoalCategory, verbose_name='Категория', on_delete=models.PROTECT, related_name='goals')
+    # Copy of category.board, so board-scoped queries and permission checks need no joins
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='goals',
+        null=True, editable=False, db_index=False,
+    )
+    search_vector = SearchVectorField(verbose_name='Поисковый вектор', null=True, editable=False)
+
+    objects = GoalManager()
 
     class Meta:
         verbose_name = 'Цель'
         verbose_name_plural = 'Цели'
+        indexes = [
+            GinIndex(fields=['search_vector'], name='goal_search_vector_idx'),
+            # status=4 is Status.archived
+            models.Index(fields=['user', 'status'], condition=~Q(status=4), name='goal_user_active_idx'),
+            models.Index(fields=['category', 'status'], name='goal_category_status_idx'),
+            models.Index(fields=['board', 'status'], name='goal_board_status_idx'),
+            # Overdue goals of a board: status in (to_do, in_progress)
+            models.Index(fields=['board', 'due_date'], condition=Q(status__in=[1, 2]), name='goal_board_overdue_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        loaded_values = getattr(self, '_loaded_values', {})
+        adding = self._state.adding
+        if self.board_id is None or self.category_id != loaded_values.get('category_id'):
+            self.board_id = self.category.board_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'board'}
+
+        update_fields = kwargs.get('update_fields')
+        saved = {'board', 'status', 'priority'} if update_fields is None else set(update_fields)
+
+        # No savepoint: the goal and its statistics are written or rolled back together with the caller's work
+        with transaction.atomic(savepoint=False):
+            stored = None
+            if not adding and not saved.isdisjoint({'board', 'board_id', 'status', 'priority'}):
+                # The values loaded with the goal may be stale, the statistics move from the stored ones
+                stored = Goal.objects.select_for_update().filter(pk=self.pk).values_list(
+                    'board_id', 'status', 'priority'
+                ).first()
+            super().save(*args, **kwargs)
+
+            # The goal moved to another board together with its category
+            if loaded_values.get('board_id') not in (None, self.board_id):
+                GoalComment.objects.filter(goal=self).update(board_id=self.board_id)
+            self._track_stats(stored, adding, saved)
+        self._loaded_values = {**loaded_values, 'category_id': self.category_id, 'board_id': self.board_id}
+
+    def _track_stats(self, stored: tuple[int, int, int] | None, adding: bool, saved: set[str]) -> None:
+        if adding:
+            old = None
+        elif stored is None:
+            # Neither the board, the status nor the priority was saved, or the goal is gone
+            return
+        else:
+            old = stored
+        new = (
+            self.board_id if adding or not saved.isdisjoint({'board', 'board_id'}) else old[0],
+            self.status if adding or 'status' in saved else old[1],
+            self.priority if adding or 'priority' in saved else old[2],
+        )
+        if old != new:
+            BoardGoalStats.record_change(old, new)
+
 
 class GoalComment(BaseModel):
     text = models.TextField(verbose_name='Текст')
     goal = models.ForeignKey(Goal, verbose_name='Цель', on_delete=models.CASCADE)
     user = models.ForeignKey(User, verbose_name='Автор', on_delete=models.CASCADE, related_name='comments')
+    # Copy of goal.board, so board-scoped queries and permission checks need no joins
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='comments',
+        null=True, editable=False, db_index=False,
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
-        verbose_name_plural = 'Комментарии'
\ No newline at end of file
+        verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=['goal', '-created'], name='goalcomment_goal_created_idx'),
+            models.Index(fields=['user', '-created'], name='goalcomment_user_created_idx'),
+            models.Index(fields=['board'], name='goalcomment_board_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.board_id is None or self.goal_id != getattr(self, '_loaded_values', {}).get('goal_id'):
+            self.board_id = self.goal.board_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'board'}
+
+        super().save(*args, **kwargs)
+        self._loaded_values = {**getattr(self, '_loaded_values', {}), 'goal_id': self.goal_id}
+
+
+class BoardGoalStats(models.Model):
+    """
+    Goal counters of a board, kept in step with every goal write.
+
+    Goals are counted by status, active (not archived) goals also by priority.
+    """
+
+    board = models.OneToOneField(
+        Board, verbose_name='Доска', on_delete=models.CASCADE, primary_key=True, related_name='goal_stats'
+    )
+    status_to_do = models.IntegerField(verbose_name='К выполнению', default=0)
+    status_in_progress = models.IntegerField(verbose_name='В процессе', default=0)
+    status_done = models.IntegerField(verbose_name='Выполнено', default=0)
+    status_archived = models.IntegerField(verbose_name='Архив', default=0)
+    priority_low = models.IntegerField(verbose_name='Низкий приоритет', default=0)
+    priority_medium = models.IntegerField(verbose_name='Средний приоритет', default=0)
+    priority_high = models.IntegerField(verbose_name='Высокий приоритет', default=0)
+    priority_critical = models.IntegerField(verbose_name='Критический приоритет', default=0)
+    updated = models.DateTimeField(verbose_name='Дата последнего обновления', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Статистика доски'
+        verbose_name_plural = 'Статистика досок'
+
+    def __str__(self):
+        return self.board.title
+
+    @staticmethod
+    def status_field(status: int) -> str:
+        return f'status_{Goal.Status(status).name}'
+
+    @staticmethod
+    def priority_field(priority: int) -> str:
+        return f'priority_{Goal.Priority(priority).name}'
+
+    @classmethod
+    def get_counters(cls, status: int, priority: int) -> list[str]:
+        """
+        Return the names of the counters that include a goal with the given status and priority.
+        """
+        if status == Goal.Status.archived:
+            return [cls.status_field(status)]
+        return [cls.status_field(status), cls.priority_field(priority)]
+
+    @classmethod
+    def record_change(cls, old: tuple[int, int, int] | None, new: tuple[int, int, int] | None) -> None:
+        """
+        Move one goal between counters.
+
+        Args:
+            old (tuple[int, int, int] | None): `(board_id, status, priority)` before the write, None for a new goal
+            new (tuple[int, int, int] | None): `(board_id, status, priority)` after the write
+        """
+        cls.record_changes([(old, new)])
+
+    @classmethod
+    def record_changes(cls, changes: Iterable[tuple[tuple | None, tuple | None]]) -> None:
+        """
+        Move many goals between counters with one `UPDATE` per board.
+
+        Args:
+            changes (Iterable[tuple[tuple | None, tuple | None]]): `(old, new)` pairs as in `record_change`
+        """
+        deltas = defaultdict(Counter)
+        for old, new in changes:
+            cls.collect_change(deltas, old, new)
+        cls.apply(deltas)
+
+    @classmethod
+    def collect_change(
+        cls, deltas: dict[int, Counter], old: tuple | None, new: tuple | None, count: int = 1
+    ) -> None:
+        """
+        Add the move of `count` goals from `old` to `new` to the `{board_id: {counter: delta}}` changes.
+        """
+        for values, delta in [(old, -count), (new, count)]:
+            if values is None or values[0] is None:
+                continue
+            board_id, status, priority = values
+            for field in cls.get_counters(status, priority):
+                deltas[board_id][field] += delta
+
+    @classmethod
+    def apply(cls, deltas: dict[int, Counter]) -> None:
+        """
+        Add the `{board_id: {counter: delta}}` changes with atomic `UPDATE ... SET x = x + delta` statements.
+
+        Must be called after the goal changes were written, in the same transaction:
+        a board without statistics yet gets them counted from its goals instead.
+        """
+        missing = []
+        for board_id, counters in deltas.items():
+            changes = {field: F(field) + delta for field, delta in counters.items() if delta}
+            if changes and not cls.objects.filter(board_id=board_id).update(**changes, updated=timezone.now()):
+                missing.append(board_id)
+        if missing:
+            cls.refresh(missing)
+
+    @classmethod
+    def refresh(cls, board_ids: Iterable[int]) -> list['BoardGoalStats']:
+        """
+        Recount the statistics of the boards from their goals.
+
+        Returns:
+            list[BoardGoalStats]: Statistics of the boards
+        """
+        board_ids = list(board_ids)
+        fields = [cls.status_field(status) for status in Goal.Status]
+        fields += [cls.priority_field(priority) for priority in Goal.Priority]
+        counters = {board_id: dict.fromkeys(fields, 0) for board_id in board_ids}
+        counts = (
+            Goal.objects.filter(board_id__in=board_ids).order_by()
+            .values('board_id', 'status', 'priority').annotate(count=Count('pk'))
+        )
+        for row in counts:
+            for field in cls.get_counters(row['status'], row['priority']):
+                counters[row['board_id']][field] += row['count']
+        return [
+            cls.objects.update_or_create(board_id=board_id, defaults=board_counters)[0]
+            for board_id, board_counters in counters.items()
+        ]
+
+
+class CascadeJob(BaseModel):
+    """
+    Deferred archiving of the goals of a deleted board or category.
+
+    With `DEFERRED_CASCADE` on, deletion only flips the `is_deleted` flags, which already hides the goals,
+    and queues a job; the `run_cascades` worker archives the goals `batch_size` at a time,
+    each batch in a short transaction, and records the progress here.
+    """
+
+    class Meta:
+        verbose_name = 'Каскадное удаление'
+        verbose_name_plural = 'Каскадные удаления'
+        indexes = [
+            models.Index(fields=['id'], condition=Q(finished__isnull=True), name='cascadejob_pending_idx'),
+        ]
+
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='+', null=True, blank=True
+    )
+    category = models.ForeignKey(
+        GoalCategory, verbose_name='Категория', on_delete=models.PROTECT, related_name='+', null=True, blank=True
+    )
+    total = models.PositiveIntegerField(verbose_name='Целей к архивации', null=True, blank=True)
+    processed = models.PositiveIntegerField(verbose_name='Архивировано целей', default=0)
+    finished = models.DateTimeField(verbose_name='Дата завершения', null=True, blank=True)
+
+    def __str__(self):
+        target = f'доска {self.board_id}' if self.board_id else f'категория {self.category_id}'
+        return f'{target}: {self.processed}/{self.total if self.total is not None else "?"}'
+
+    def get_goals(self) -> GoalQuerySet:
+        if self.board_id:
+            goals = Goal.objects.filter(board_id=self.board_id)
+        else:
+            goals = Goal.objects.filter(category_id=self.category_id)
+        return goals.exclude(status=Goal.Status.archived)
+
+    def get_user_ids(self) -> list[int]:
+        if self.board_id:
+            categories = GoalCategory.objects.filter(board_id=self.board_id)
+            participants = BoardParticipant.objects.filter(board_id=self.board_id)
+            return [*categories.values_list('user_id', flat=True), *participants.values_list('user_id', flat=True)]
+        return [self.category.user_id]
+
+    def run_batch(self, batch_size: int) -> int:
+        """
+        Archive the next `batch_size` goals, marking the job finished when none are left.
+
+        Must be called in a transaction holding the lock on the job row.
+
+        Returns:
+            int: Number of archived goals
+        """
+        goals = self.get_goals().order_by('pk')
+        if self.total is None:
+            self.total = goals.count()
+        ids = list(goals.values_list('pk', flat=True)[:batch_size])
+        archived = Goal.objects.filter(pk__in=ids).archive() if ids else 0
+        self.processed += archived
+        if len(ids) < batch_size:
+            self.finished = timezone.now()
+            # Goals are archived in bulk without signals, refresh the lists of everyone the deletion touched
+            bump_list_generations(self.get_user_ids())
+        self.save(update_fields=['total', 'processed', 'finished', 'updated'])
+        return archived
+
+    @classmethod
+    def run_next(cls, batch_size: int) -> 'CascadeJob | None':
+        """
+        Run one batch of the oldest unfinished job that is not being run by another worker.
+
+        Returns:
+            CascadeJob | None: The job, None if there is nothing to do
+        """
+        with transaction.atomic():
+            pending = cls.objects.filter(finished__isnull=True).order_by('pk')
+            job = pending.select_for_update(skip_locked=True).first()
+            if job is not None:
+                job.run_batch(batch_size)
+        return job
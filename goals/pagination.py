@@ -0,0 +1,355 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict, namedtuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import DatabaseError
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple('Cursor', ['ordering', 'values', 'reverse'])
+
+
+class CountModePagination(LimitOffsetPagination):
+    """
+    `LimitOffsetPagination` with a choice of how the total `count` is computed.
+
+    - `exact`: a full `COUNT(*)`, the stock behaviour;
+    - `capped`: counting stops after `count_cap` rows;
+    - `estimated`: the planner's row estimate from `EXPLAIN`; below `count_cap` the rows are counted up to the cap,
+      which gives an exact count or, when the planner underestimated, `count_cap` reported as estimated.
+
+    Views opt in with `pagination_count_mode`, clients may pick a mode with `?count_mode=`.
+    Whenever the mode is not plain `exact` the response carries `count_mode` with the way the number was obtained,
+    and the page is fetched with one extra row, so `next` does not depend on the count.
+    """
+
+    count_modes = ('exact', 'capped', 'estimated')
+    count_mode = 'exact'
+    count_cap = 1000
+    count_mode_query_param = 'count_mode'
+    count_mode_query_description = 'How to compute `count`: exact, capped or estimated.'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None):
+        self.requested_count_mode = self.get_count_mode(request, view)
+        self.used_count_mode = 'exact'
+        if self.requested_count_mode == 'exact':
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        results = results[:self.limit]
+
+        if not self.has_next and (results or not self.offset):
+            # The last page tells the exact count for free
+            self.count = self.offset + len(results)
+        else:
+            self.count, self.used_count_mode = self.get_approximate_count(
+                queryset, lower_bound=self.offset + len(results) + self.has_next
+            )
+
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        return results
+
+    def get_count_mode(self, request: Request, view) -> str:
+        mode = request.query_params.get(self.count_mode_query_param)
+        if mode in self.count_modes:
+            return mode
+        return getattr(view, 'pagination_count_mode', self.count_mode)
+
+    def get_approximate_count(self, queryset: QuerySet, lower_bound: int) -> tuple[int, str]:
+        over_cap_mode = 'capped'
+        if self.requested_count_mode == 'estimated':
+            estimate = self.estimate_count(queryset)
+            if estimate is not None and estimate >= self.count_cap:
+                return max(estimate, lower_bound), 'estimated'
+            if estimate is not None:
+                # The planner often underestimates filtered lists, so counting stops at the cap all the same
+                over_cap_mode = 'estimated'
+
+        if lower_bound > self.count_cap:
+            return lower_bound, over_cap_mode
+        count = queryset[:self.count_cap + 1].count()
+        if count > self.count_cap:
+            return self.count_cap, over_cap_mode
+        return count, 'exact'
+
+    def estimate_count(self, queryset: QuerySet) -> int | None:
+        try:
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        except (DatabaseError, ValueError, TypeError, KeyError, IndexError):
+            return None
+
+    def get_paginated_response(self, data) -> Response:
+        response = super().get_paginated_response(data)
+        if self.requested_count_mode != 'exact':
+            response.data['count_mode'] = self.used_count_mode
+        return response
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_mode'] = {'type': 'string', 'enum': list(self.count_modes)}
+        return response_schema
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.count_mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.count_mode_query_description,
+                'schema': {'type': 'string', 'enum': list(self.count_modes)},
+            },
+        ]
+
+    def get_next_link(self) -> str | None:
+        if self.requested_count_mode != 'exact' and not self.has_next:
+            return None
+        return super().get_next_link()
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over the view ordering with a tiebreak on `id`.
+
+    Instead of OFFSET the next page is selected with a `WHERE (field, id) > (last_field, last_id)` predicate,
+    so every page costs the same however deep the client scrolls, and no `COUNT(*)` is run.
+    The position is passed around as an opaque `cursor` token.
+    """
+
+    cursor_query_param = 'cursor'
+    cursor_query_description = 'Opaque pagination cursor. Pass an empty value to get the first page.'
+    limit_query_param = 'limit'
+    limit_query_description = 'Number of results to return per page.'
+    default_limit = 100
+    max_limit = 1000
+    ordering = ('-created',)
+    tiebreak_field = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [self._get_field(queryset, term.lstrip('-')) for term in self.ordering]
+        if queryset.query.values_select:
+            # Rows of a `values()` queryset have to carry the cursor fields
+            lookups = [*queryset.query.values_select, *(field.attname for field in self.fields)]
+            queryset = queryset.values(*dict.fromkeys(lookups))
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor.reverse if cursor else False
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if cursor is not None:
+            queryset = queryset.filter(self._seek(cursor.values, reverse))
+
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.cursor_query_description,
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.limit_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.limit_query_description,
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_limit(self, request: Request) -> int:
+        try:
+            return _positive_int(request.query_params[self.limit_query_param], strict=True, cutoff=self.max_limit)
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_ordering(self, request: Request, queryset: QuerySet, view) -> list[str]:
+        """
+        Take the ordering from the view's `OrderingFilter` (so `?ordering=` keeps working),
+        falling back to `view.ordering` and then to `self.ordering`, and append the `id` tiebreak.
+        """
+        ordering = None
+        for filter_cls in getattr(view, 'filter_backends', []):
+            if issubclass(filter_cls, OrderingFilter):
+                ordering = filter_cls().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = getattr(view, 'ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        ordering = [term for term in ordering if term.lstrip('-') != self.tiebreak_field]
+        descending = ordering[-1].startswith('-') if ordering else False
+        return ordering + [f"{'-' if descending else ''}{self.tiebreak_field}"]
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, obj, reverse: bool) -> str:
+        if isinstance(obj, dict):
+            values = [self._dump_value(obj[field.attname]) for field in self.fields]
+        else:
+            values = [self._dump_value(getattr(obj, field.attname)) for field in self.fields]
+        payload = json.dumps({'o': self.ordering, 'v': values, 'r': reverse}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request: Request) -> Cursor | None:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            ordering, values, reverse = payload['o'], payload['v'], bool(payload['r'])
+            if ordering != self.ordering or len(values) != len(self.fields):
+                raise ValueError
+            values = [None if value is None else field.to_python(value) for field, value in zip(self.fields, values)]
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(ordering=ordering, values=values, reverse=reverse)
+
+    def _get_field(self, queryset: QuerySet, name: str):
+        try:
+            return queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _is_descending(self, term: str, reverse: bool) -> bool:
+        return term.startswith('-') != reverse
+
+    def _order_by(self, reverse: bool) -> list:
+        order_by = []
+        for term, field in zip(self.ordering, self.fields):
+            expression = F(field.name)
+            if self._is_descending(term, reverse):
+                order_by.append(expression.desc(nulls_first=True) if field.null else expression.desc())
+            else:
+                order_by.append(expression.asc(nulls_last=True) if field.null else expression.asc())
+        return order_by
+
+    def _seek(self, values: list, reverse: bool) -> Q:
+        """
+        Build the lexicographic "comes after the cursor" predicate:
+        `f1 > v1 OR (f1 = v1 AND f2 > v2) OR ...`, where NULLs sort last ascending and first descending.
+        """
+        predicate = Q(pk__in=[])
+        equal = Q()
+        for term, field, value in zip(self.ordering, self.fields, values):
+            name = field.name
+            if self._is_descending(term, reverse):
+                after = Q(**{f'{name}__isnull': False}) if value is None else Q(**{f'{name}__lt': value})
+            else:
+                after = Q(pk__in=[]) if value is None else Q(**{f'{name}__gt': value})
+                if value is not None and field.null:
+                    after |= Q(**{f'{name}__isnull': True})
+
+            predicate |= equal & after
+            equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+        return predicate
+
+    @staticmethod
+    def _dump_value(value):
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
+
+
+class LimitOffsetKeysetPagination(CountModePagination):
+    """
+    `CountModePagination` with an opt-in keyset mode: requests carrying the `cursor` query parameter
+    are paginated by `KeysetPagination`, everything else keeps the limit/offset behaviour.
+    """
+
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data) -> Response:
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        keyset_parameters = [
+            parameter
+            for parameter in self.keyset_class().get_schema_operation_parameters(view)
+            if parameter['name'] != self.limit_query_param
+        ]
+        return super().get_schema_operation_parameters(view) + keyset_parameters
+
+    def get_next_link(self) -> str | None:
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self) -> str | None:
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
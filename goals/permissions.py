@@ -1,48 +1,89 @@
+from django.db.models import Exists, OuterRef, QuerySet
 from rest_framework import permissions
 from rest_framework.generics import GenericAPIView
 from rest_framework.request import Request
 
 from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.roles import WRITE_ROLES, has_board_role
 
 
-class BoardPermission(permissions.BasePermission):
-    def has_object_permission(self, request: Request, view: GenericAPIView, obj: Board) -> bool:
-        if not request.user.is_authenticated:
-            return False
-        if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(user=request.user, board=obj).exists()
-        return BoardParticipant.objects.filter(user=request.user, board=obj, role=BoardParticipant.Role.owner).exists()
+class BoardRolePermission(permissions.BasePermission):
+    """
+    Grants access by the user's role on the board the object belongs to.
 
+    Any participant may read (`safe_roles = None`), only `write_roles` may modify.
+    Views may resolve the check inside their own query with `annotate_queryset`.
+    """
 
-class CategoryPermission(permissions.BasePermission):
-    def has_object_permission(self, request: Request, view: GenericAPIView, obj: GoalCategory) -> bool:
-        if not request.user.is_authenticated:
-            return False
-        if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(user=request.user, board=obj.board).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user, board=obj.board, role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ).exists()
+    safe_roles: tuple[int, ...] | None = None
+    write_roles: tuple[int, ...] = (BoardParticipant.Role.owner,)
+    board_field = 'board'
+
+    def get_board_id(self, obj) -> int:
+        return obj.board_id
+
+    def get_roles(self, request: Request) -> tuple[int, ...] | None:
+        return self.safe_roles if request.method in permissions.SAFE_METHODS else self.write_roles
 
+    def annotate_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        """
+        Add a `board_access` flag computed by an `EXISTS` subquery on `BoardParticipant`,
+        so the object and the permission come with one query. Objects stay visible either way,
+        which keeps 403 for strangers and 404 for missing objects.
+        """
+        if not request.user.is_authenticated:
+            return queryset
+        participants = BoardParticipant.objects.filter(user=request.user, board=OuterRef(self.board_field))
+        roles = self.get_roles(request)
+        if roles is not None:
+            participants = participants.filter(role__in=roles)
+        return queryset.annotate(board_access=Exists(participants))
 
-class GoalPermission(permissions.BasePermission):
-    def has_object_permission(self, request: Request, view: GenericAPIView, obj: Goal) -> bool:
+    def has_object_permission(self, request: Request, view: GenericAPIView, obj) -> bool:
         if not request.user.is_authenticated:
             return False
-        if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(user=request.user, board__categories=obj.category).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user,
-            board__categories=obj.category,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-        ).exists()
+        if getattr(obj, 'board_access', None) is not None:
+            return obj.board_access
+        return has_board_role(request, self.get_board_id(obj), self.get_roles(request))
+
+
+class BoardPermission(BoardRolePermission):
+    board_field = 'pk'
+
+    def get_board_id(self, obj: Board) -> int:
+        return obj.pk
+
+
+class BoardContentPermission(BoardPermission):
+    """Writes of the board content, e.g. imports, are open to writers as well as owners."""
 
+    write_roles = WRITE_ROLES
+
+
+class CategoryPermission(BoardRolePermission):
+    write_roles = WRITE_ROLES
+
+    def get_board_id(self, obj: GoalCategory) -> int:
+        return obj.board_id
+
+
+class GoalPermission(BoardRolePermission):
+    write_roles = WRITE_ROLES
+
+    def get_board_id(self, obj: Goal) -> int:
+        return obj.board_id
+
+
+class CommentPermission(BoardRolePermission):
+    def get_board_id(self, obj: GoalComment) -> int:
+        return obj.board_id
+
+    def annotate_queryset(self, queryset: QuerySet, request: Request) -> QuerySet:
+        if request.method not in permissions.SAFE_METHODS:
+            return queryset
+        return super().annotate_queryset(queryset, request)
 
-class CommentPermission(permissions.BasePermission):
     def has_object_permission(self, request: Request, view: GenericAPIView, obj: GoalComment) -> bool:
-        if not request.user.is_authenticated:
-            return False
-        if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(user=request.user, board__categories__goals=obj.goal).exists()
-        else:
-            return request.user == obj.user
\ No newline at end of file
+        if request.user.is_authenticated and request.method not in permissions.SAFE_METHODS:
+            return request.user == obj.user
+        return super().has_object_permission(request, view, obj)
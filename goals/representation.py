@@ -0,0 +1,128 @@
+from collections.abc import Callable, Iterable
+from datetime import date
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+
+class UnsupportedField(Exception):
+    """The serializer field can not be rendered from a `values()` row."""
+
+
+class ValuesRepresentation:
+    """
+    Read-only counterpart of a `ModelSerializer` that renders `QuerySet.values()` rows.
+
+    The serializer's readable fields are compiled once into `(name, lookup, converter)` entries:
+    plain columns are copied as they come from the database, dates, datetimes and choices go through
+    converters that reproduce the DRF field output, nested serializers of foreign keys read the joined
+    `fk__field` lookups. The result is equal to `serializer.data` item by item, without building model
+    instances or dispatching through `Field.get_attribute` / `to_representation` for every value.
+    """
+
+    def __init__(self, serializer: serializers.ModelSerializer):
+        self.lookups: list[str] = []
+        self.entries = self._compile(serializer, prefix='')
+
+    @classmethod
+    def from_serializer(cls, serializer: serializers.ModelSerializer) -> 'ValuesRepresentation | None':
+        """
+        Compile the representation of the serializer.
+
+        Returns:
+            ValuesRepresentation | None: Representation, None if some field needs model instances
+        """
+        try:
+            return cls(serializer)
+        except UnsupportedField:
+            return None
+
+    def to_representation(self, rows: Iterable[dict]) -> list[dict]:
+        return [self._build(self.entries, row) for row in rows]
+
+    def _build(self, entries: list, row: dict) -> dict:
+        data = {}
+        for name, lookup, convert in entries:
+            value = row[lookup]
+            if value is None or convert is None:
+                data[name] = value
+            elif type(convert) is list:
+                data[name] = self._build(convert, row)
+            else:
+                data[name] = convert(value)
+        return data
+
+    def _compile(self, serializer: serializers.ModelSerializer, prefix: str) -> list:
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+        if model is None:
+            raise UnsupportedField(type(serializer).__name__)
+
+        entries = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise UnsupportedField(name)
+            if not model_field.concrete:
+                raise UnsupportedField(name)
+
+            # `values('fk')` gives the primary key of the related row, which is also the null check of nested data
+            lookup = f'{prefix}{field.source}'
+            self.lookups.append(lookup)
+            if isinstance(field, serializers.BaseSerializer):
+                if not model_field.many_to_one or isinstance(field, serializers.ListSerializer):
+                    raise UnsupportedField(name)
+                entries.append((name, lookup, self._compile(field, prefix=f'{lookup}__')))
+            else:
+                entries.append((name, lookup, self._get_converter(field, model_field)))
+        return entries
+
+    @staticmethod
+    def _get_converter(field: serializers.Field, model_field: models.Field) -> Callable | None:
+        """
+        Return the function giving the DRF representation of a non-null column value, None if it is the value itself.
+        """
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return None if field.pk_field is None else field.pk_field.to_representation
+        if isinstance(field, serializers.RelatedField):
+            raise UnsupportedField(field.field_name)
+
+        if isinstance(field, serializers.ChoiceField):
+            missing = object()
+            known = {choice: field.to_representation(choice) for choice in field.choices}
+
+            def convert_choice(value, get=known.get, slow=field.to_representation):
+                result = get(value, missing)
+                return slow(value) if result is missing else result
+            return convert_choice
+
+        if isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+            if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+                return field.to_representation
+
+            def convert_datetime(value):
+                value = value.astimezone(field_timezone).isoformat()
+                return value[:-6] + 'Z' if value.endswith('+00:00') else value
+            return convert_datetime
+
+        if isinstance(field, serializers.DateField):
+            output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+            if output_format is not None and output_format.lower() == ISO_8601:
+                return date.isoformat
+            return field.to_representation
+
+        if type(field) in (serializers.CharField, serializers.EmailField) and isinstance(
+            model_field, (models.CharField, models.TextField)
+        ):
+            return None
+        if type(field) is serializers.IntegerField and isinstance(model_field, (models.IntegerField, models.AutoField)):
+            return None
+        if type(field) is serializers.BooleanField and isinstance(model_field, models.BooleanField):
+            return None
+        return field.to_representation
@@ -0,0 +1,96 @@
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpRequest
+from rest_framework.request import Request
+
+from goals.cache import get_shared_cache
+from goals.models import BoardParticipant
+
+WRITE_ROLES = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+
+
+def _cache_key(user_id: int) -> str:
+    return f'goals:board_roles:{user_id}'
+
+
+def load_board_roles(user_id: int) -> dict[int, int]:
+    """
+    Return the `{board_id: role}` map of the user's live boards.
+
+    Memberships change rarely, so the map is kept in the `BOARD_ROLES_CACHE` cache for
+    `BOARD_ROLES_CACHE_TTL` seconds and dropped by `invalidate_board_roles` whenever it changes.
+    A cache local to the process is not used: another worker could not drop its copy.
+
+    Args:
+        user_id (int): User ID
+    Returns:
+        dict[int, int]: Role of the user on every board they participate in
+    """
+    cache = get_shared_cache(settings.BOARD_ROLES_CACHE)
+    key = _cache_key(user_id)
+    roles = cache.get(key) if cache is not None else None
+    if roles is None:
+        roles = dict(
+            BoardParticipant.objects.filter(user_id=user_id, board__is_deleted=False).values_list('board_id', 'role')
+        )
+        if cache is not None:
+            cache.set(key, roles, settings.BOARD_ROLES_CACHE_TTL)
+    return roles
+
+
+def invalidate_board_roles(user_ids: Iterable[int]) -> None:
+    """
+    Drop the cached role maps of the users whose memberships were changed.
+
+    Args:
+        user_ids (Iterable[int]): IDs of the affected users
+    """
+    keys = [_cache_key(user_id) for user_id in set(user_ids)]
+    cache = get_shared_cache(settings.BOARD_ROLES_CACHE)
+    if not keys or cache is None:
+        return
+    cache.delete_many(keys)
+    # A concurrent request may re-cache the old memberships before the change is committed
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_board_roles(request: Request | HttpRequest) -> dict[int, int]:
+    """
+    Return the `{board_id: role}` map of the request user.
+
+    The map comes from `load_board_roles` and is memoized on the underlying `HttpRequest`,
+    so permission classes and serializer validators of one request share it.
+
+    Args:
+        request (Request | HttpRequest): Request of an authenticated user
+    Returns:
+        dict[int, int]: Role of the user on every board they participate in
+    """
+    http_request = getattr(request, '_request', request)
+    roles = getattr(http_request, '_board_roles', None)
+    if roles is None:
+        roles = load_board_roles(request.user.pk)
+        http_request._board_roles = roles
+    return roles
+
+
+def get_board_role(request: Request | HttpRequest, board_id: int | str | None) -> int | None:
+    if not request.user.is_authenticated or board_id is None:
+        return None
+    try:
+        board_id = int(board_id)
+    except (TypeError, ValueError):
+        return None
+    return get_board_roles(request).get(board_id)
+
+
+def has_board_role(
+    request: Request | HttpRequest, board_id: int | str | None, roles: Iterable[int] | None = None
+) -> bool:
+    """
+    Check that the request user participates in the board, optionally with one of `roles`.
+    """
+    role = get_board_role(request, board_id)
+    return role is not None and (roles is None or role in roles)
@@ -1,10 +1,49 @@
 from django.db import transaction
-from rest_framework import exceptions, serializers
+from django.utils import timezone
+from rest_framework import exceptions, permissions, serializers
+from rest_framework.request import Request
 
 from core.models import User
 from core.serializes import UserSerializer
 
-from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.models import Board, BoardGoalStats, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.roles import WRITE_ROLES, has_board_role
+
+
+def get_sparse_fields(request: Request, field_names: list[str]) -> list[str] | None:
+    """
+    Return the fields selected by the `?fields=` and `?omit=` comma-separated lists of a read request.
+
+    Args:
+        request (Request): Current request
+        field_names (list[str]): Fields of the serializer in their output order
+    Returns:
+        list[str] | None: Selected fields in output order, None when the request asks for all of them
+    """
+    if request.method not in permissions.SAFE_METHODS:
+        return None
+    fields, omit = request.query_params.get('fields'), request.query_params.get('omit')
+    if not fields and not omit:
+        return None
+    selected = {name.strip() for name in fields.split(',')} if fields else set(field_names)
+    selected -= {name.strip() for name in (omit or '').split(',')}
+    return [name for name in field_names if name in selected]
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer mixin that trims the representation to the fields selected by `get_sparse_fields`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+        selected = get_sparse_fields(request, list(self.fields))
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
 
 
 class BoardParticipantSerializer(serializers.ModelSerializer):
@@ -77,6 +116,8 @@ class BoardSerializer(serializers.ModelSerializer):
             # Update roles of existing participants
             BoardParticipant.objects.bulk_update(participants_to_update, ['role'])
 
+            # Saved after the participants: bulk writes send no signals, the board's one refreshes the cached
+            # roles and lists of all the current participants
             instance.title = validated_data['title']
             instance.save()
 
@@ -89,7 +130,35 @@ class BoardListSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class BoardStatsSerializer(serializers.ModelSerializer):
+    total = serializers.SerializerMethodField()
+    by_status = serializers.SerializerMethodField()
+    by_priority = serializers.SerializerMethodField()
+    overdue = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BoardGoalStats
+        fields = ('board', 'total', 'by_status', 'by_priority', 'overdue', 'updated')
+
+    def get_total(self, obj: BoardGoalStats) -> int:
+        return sum(self.get_by_priority(obj).values())
+
+    def get_by_status(self, obj: BoardGoalStats) -> dict[str, int]:
+        return {status.name: getattr(obj, obj.status_field(status)) for status in Goal.Status}
+
+    def get_by_priority(self, obj: BoardGoalStats) -> dict[str, int]:
+        return {priority.name: getattr(obj, obj.priority_field(priority)) for priority in Goal.Priority}
+
+    def get_overdue(self, obj: BoardGoalStats) -> int:
+        # Depends on the current date, so it is counted on read from the partial overdue index
+        return Goal.objects.filter(
+            board_id=obj.board_id,
+            status__in=(Goal.Status.to_do, Goal.Status.in_progress),
+            due_date__lt=timezone.localdate(),
+        ).count()
+
+
+class CategorySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     board = serializers.PrimaryKeyRelatedField(read_only=True)
 
@@ -118,26 +187,23 @@ class CategoryCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Category already exists.')
 
         # Check if the user has the required role in the board
-        user = self.context['request'].user
         board = self.initial_data.get('board')
 
         if board is None:
             raise serializers.ValidationError('Board is required.')
 
-        participant = BoardParticipant.objects.filter(board=board, user=user).first()
-
-        if participant is None or participant.role not in [BoardParticipant.Role.owner, BoardParticipant.Role.writer]:
+        if not has_board_role(self.context['request'], board, WRITE_ROLES):
             raise serializers.ValidationError('You do not have permission to create a category.')
 
         return value
 
 
-class GoalSerializer(serializers.ModelSerializer):
+class GoalSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
         model = Goal
-        fields = '__all__'
+        exclude = ('search_vector', 'board')
         read_only_fields = ('id', 'created', 'updated', 'user')
 
 
@@ -147,28 +213,94 @@ class GoalCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Goal
         read_only_fields = ('id', 'created', 'updated', 'user')
-        fields = '__all__'
+        exclude = ('search_vector', 'board')
 
     def validate_category(self, category: GoalCategory) -> GoalCategory:
         if category.is_deleted:
             raise exceptions.NotFound('Category does not exist')
 
-        user = self.context['request'].user
-
-        if not category.board.participants.filter(
-            user=user, role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        ).exists():
+        if not has_board_role(self.context['request'], category.board_id, WRITE_ROLES):
             raise exceptions.PermissionDenied('You do not have permission to create a goal in this category.')
 
         return category
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class BulkCategoryField(serializers.PrimaryKeyRelatedField):
+    """
+    Category looked up in the `{pk: category}` map the view preloads into the `categories` context.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            category = self.context['categories'].get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if category is None:
+            self.fail('does_not_exist', pk_value=data)
+        return category
+
+
+class GoalBulkCreateSerializer(GoalCreateSerializer):
+    category = BulkCategoryField(queryset=GoalCategory.objects.all())
+
+    def validate_category(self, category: GoalCategory) -> GoalCategory:
+        # Access errors are reported per goal instead of failing the whole request
+        try:
+            return super().validate_category(category)
+        except (exceptions.NotFound, exceptions.PermissionDenied) as exc:
+            raise serializers.ValidationError(exc.detail)
+
+
+class GoalPatchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Goal
+        fields = ('status', 'priority', 'category')
+        extra_kwargs = {field: {'required': False} for field in fields}
+
+    def validate_category(self, category: GoalCategory) -> GoalCategory:
+        if category.is_deleted:
+            raise serializers.ValidationError('Category does not exist')
+
+        if not has_board_role(self.context['request'], category.board_id, WRITE_ROLES):
+            raise exceptions.PermissionDenied('You do not have permission to move goals to this category.')
+
+        return category
+
+    def validate(self, attrs: dict) -> dict:
+        if not attrs:
+            raise serializers.ValidationError('Nothing to update.')
+        return attrs
+
+
+class GoalBulkUpdateSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=10000)
+    filter = serializers.DictField(required=False)
+    patch = GoalPatchSerializer()
+
+    # A filter must name the categories it changes, so a request can not touch every writable board by mistake
+    filter_scope_fields = ('category', 'category__in')
+
+    def validate_filter(self, value: dict) -> dict:
+        if not any(value.get(field) not in (None, '', []) for field in self.filter_scope_fields):
+            raise serializers.ValidationError(
+                f'Filter by {" or ".join(self.filter_scope_fields)} is required.'
+            )
+        return value
+
+    def validate(self, attrs: dict) -> dict:
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Either ids or filter is required.')
+        return attrs
+
+
+class CommentSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
         model = GoalComment
-        fields = '__all__'
+        exclude = ('board',)
         read_only_fields = ('id', 'created', 'updated', 'user')
 
 
@@ -178,18 +310,14 @@ class CommentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = GoalComment
         read_only_fields = ('id', 'created', 'updated', 'user')
-        fields = '__all__'
+        exclude = ('board',)
 
     def validate_goal(self, goal: Goal) -> Goal:
         if goal.status == Goal.Status.archived:
             raise exceptions.NotFound('Goal not exists')
 
         # Check if the user is a participant in the board with the goal
-        if not BoardParticipant.objects.filter(
-            user=self.context['request'].user,
-            board__categories=goal.category,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-        ).exists():
+        if not has_board_role(self.context['request'], goal.board_id, WRITE_ROLES):
             raise serializers.ValidationError('You do not have permission to comment on this goal.')
 
         return goal
\ No newline at end of file
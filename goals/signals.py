@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from goals.cache import bump_list_generations
+from goals.models import Board, BoardParticipant, GoalCategory
+from goals.roles import invalidate_board_roles
+
+
+@receiver([post_save, post_delete], sender=BoardParticipant)
+def participant_changed(sender, instance: BoardParticipant, **kwargs) -> None:
+    invalidate_board_roles([instance.user_id])
+    bump_list_generations([instance.user_id])
+
+
+@receiver(post_save, sender=Board)
+def board_saved(sender, instance: Board, created: bool, **kwargs) -> None:
+    if created:
+        return
+    # Role maps leave out deleted boards, and the board lists show the title
+    user_ids = list(instance.participants.values_list('user_id', flat=True))
+    invalidate_board_roles(user_ids)
+    bump_list_generations(user_ids)
+
+
+@receiver([post_save, post_delete], sender=GoalCategory)
+def category_changed(sender, instance: GoalCategory, **kwargs) -> None:
+    bump_list_generations([instance.user_id])
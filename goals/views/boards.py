@@ -1,20 +1,38 @@
+from dataclasses import asdict
+
+from django.conf import settings
 from django.db import transaction
-from rest_framework import filters, permissions
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.pagination import LimitOffsetPagination
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import filters, permissions, serializers
+from rest_framework.generics import (
+    CreateAPIView, GenericAPIView, ListAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
+)
+from rest_framework.parsers import MultiPartParser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 
-from goals.models import Board, Goal
-from goals.permissions import BoardPermission
-from goals.serializers import BoardCreateSerializer, BoardListSerializer, BoardSerializer
+from goals.cache import CachedListMixin, bump_list_generations
+from goals.export import EXPORT_FORMATS, iter_board_rows
+from goals.filters import TrigramSearchFilter
+from goals.importer import IMPORT_FORMATS, GoalImporter
+from goals.models import Board, BoardGoalStats, CascadeJob, Goal
+from goals.pagination import CountModePagination
+from goals.permissions import BoardContentPermission, BoardPermission
+from goals.serializers import BoardCreateSerializer, BoardListSerializer, BoardSerializer, BoardStatsSerializer
+from goals.views.mixins import BoardAccessQuerysetMixin, ConditionalGetMixin, FastListMixin
 
 
-class BoardListView(ListAPIView):
+class BoardListView(CachedListMixin, ConditionalGetMixin, FastListMixin, ListAPIView):
     serializer_class = BoardListSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = LimitOffsetPagination
-    filter_backends = [filters.OrderingFilter]
+    pagination_class = CountModePagination
+    filter_backends = [filters.OrderingFilter, TrigramSearchFilter]
     ordering_fields = ['title']
     ordering = ['title']
+    search_fields = ['title']
 
     def get_queryset(self):
         return Board.objects.filter(participants__user=self.request.user, is_deleted=False)
@@ -25,7 +43,7 @@ class BoardCreateView(CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class BoardDetailView(RetrieveUpdateDestroyAPIView):
+class BoardDetailView(BoardAccessQuerysetMixin, ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated, BoardPermission]
     serializer_class = BoardSerializer
 
@@ -36,5 +54,105 @@ class BoardDetailView(RetrieveUpdateDestroyAPIView):
         with transaction.atomic():
             instance.is_deleted = True
             instance.save()
-            instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(status=Goal.Status.archived)
\ No newline at end of file
+            # `updated` marks the categories for the incremental exports
+            instance.categories.update(is_deleted=True, updated=timezone.now())
+            if settings.DEFERRED_CASCADE:
+                # Goals of deleted categories are hidden already, the worker archives them in batches
+                CascadeJob.objects.create(board=instance)
+            else:
+                Goal.objects.filter(board=instance).archive()
+            # The bulk update sends no signals, and the authors of the categories may have left the board since
+            bump_list_generations(instance.categories.values_list('user_id', flat=True))
+
+
+class BoardStatsView(BoardAccessQuerysetMixin, RetrieveAPIView):
+    permission_classes = [permissions.IsAuthenticated, BoardPermission]
+    serializer_class = BoardStatsSerializer
+
+    def get_queryset(self):
+        return Board.objects.select_related('goal_stats').exclude(is_deleted=True)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        board = self.get_object()
+        try:
+            stats = board.goal_stats
+        except BoardGoalStats.DoesNotExist:
+            # No goal of the board was written since the statistics were introduced
+            stats = BoardGoalStats.refresh([board.pk])[0]
+        return Response(self.get_serializer(stats).data)
+
+
+class BoardExportView(BoardAccessQuerysetMixin, RetrieveAPIView):
+    """
+    Stream the categories, goals and comments of a board as NDJSON (`?output=ndjson`, default) or CSV.
+
+    `?since=<ISO datetime>` limits the export to objects updated since then, for incremental exports;
+    they include deleted categories and goals as tombstones but not deleted comments, see `iter_board_rows`.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, BoardPermission]
+    output_query_param = 'output'
+    since_query_param = 'since'
+
+    def get_queryset(self):
+        return Board.objects.exclude(is_deleted=True)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> StreamingHttpResponse:
+        output = request.query_params.get(self.output_query_param, 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise serializers.ValidationError(
+                {self.output_query_param: [f'Choose one of: {", ".join(EXPORT_FORMATS)}.']}
+            )
+        since = self.get_since(request)
+        board = self.get_object()
+
+        write_lines, content_type = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(
+            write_lines(iter_board_rows(board.pk, since)), content_type=f'{content_type}; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename="board-{board.pk}.{output}"'
+        return response
+
+    def get_since(self, request: Request):
+        value = request.query_params.get(self.since_query_param)
+        if not value:
+            return None
+        try:
+            since = parse_datetime(value)
+        except ValueError:
+            since = None
+        if since is None:
+            raise serializers.ValidationError({self.since_query_param: ['Expected an ISO 8601 datetime.']})
+        return timezone.make_aware(since) if timezone.is_naive(since) else since
+
+
+class BoardImportView(BoardAccessQuerysetMixin, GenericAPIView):
+    """
+    Import categories and goals into a board from an uploaded NDJSON or CSV `file`.
+
+    The format comes from `?input=` or the file extension. The file is parsed as a stream and written
+    by `GoalImporter` in batches, each in its own transaction; the response reports what was created
+    and the rejected lines.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, BoardContentPermission]
+    parser_classes = [MultiPartParser]
+    input_query_param = 'input'
+
+    def get_queryset(self):
+        return Board.objects.exclude(is_deleted=True)
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        board = self.get_object()
+        upload = request.data.get('file')
+        if not upload or isinstance(upload, str):
+            raise serializers.ValidationError({'file': ['No file was submitted.']})
+        input_format = request.query_params.get(self.input_query_param) or upload.name.rpartition('.')[2].lower()
+        if input_format not in IMPORT_FORMATS:
+            raise serializers.ValidationError(
+                {self.input_query_param: [f'Choose one of: {", ".join(IMPORT_FORMATS)}.']}
+            )
+
+        report = GoalImporter(board.pk, request.user.pk).run(IMPORT_FORMATS[input_format](upload))
+        status = HTTP_201_CREATED if report.goals or report.categories or not report.failed else HTTP_400_BAD_REQUEST
+        return Response(asdict(report), status=status)
@@ -1,18 +1,26 @@
+from django.conf import settings
 from django.db import transaction
 from rest_framework import filters, permissions
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.pagination import LimitOffsetPagination
 
-from goals.models import Goal, GoalCategory
+from goals.cache import CachedListMixin
+from goals.filters import TrigramSearchFilter
+from goals.models import CascadeJob, Goal, GoalCategory
+from goals.pagination import CountModePagination
 from goals.permissions import CategoryPermission
 from goals.serializers import CategoryCreateSerializer, CategorySerializer
+from goals.views.mixins import (
+    BoardAccessQuerysetMixin, ConditionalGetMixin, FastListMixin, SparseFieldsetQuerysetMixin
+)
 
 
-class CategoryListView(ListAPIView):
+class CategoryListView(
+    CachedListMixin, SparseFieldsetQuerysetMixin, ConditionalGetMixin, FastListMixin, ListAPIView
+):
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = LimitOffsetPagination
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    pagination_class = CountModePagination
+    filter_backends = [filters.OrderingFilter, TrigramSearchFilter]
     ordering_fields = ['title', 'created']
     ordering = ['title']
     search_fields = ['title']
@@ -26,7 +34,9 @@ class CategoryCreateView(CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class CategoryDetailView(RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(
+    BoardAccessQuerysetMixin, SparseFieldsetQuerysetMixin, ConditionalGetMixin, RetrieveUpdateDestroyAPIView
+):
     serializer_class = CategorySerializer
     permission_classes = [CategoryPermission]
 
@@ -38,4 +48,7 @@ class CategoryDetailView(RetrieveUpdateDestroyAPIView):
             instance.is_deleted = True
             instance.save()
             # Changes goals status in "deleted" category to "Archived"
-            Goal.objects.filter(category=instance.id).update(status=Goal.Status.archived)
\ No newline at end of file
+            if settings.DEFERRED_CASCADE:
+                CascadeJob.objects.create(category=instance)
+            else:
+                Goal.objects.filter(category=instance.id).archive()
\ No newline at end of file
@@ -1,17 +1,20 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.pagination import LimitOffsetPagination
 
 from goals.models import GoalComment
+from goals.pagination import CountModePagination
 from goals.permissions import CommentPermission
 from goals.serializers import CommentCreateSerializer, CommentSerializer
+from goals.views.mixins import (
+    BoardAccessQuerysetMixin, ConditionalGetMixin, FastListMixin, SparseFieldsetQuerysetMixin
+)
 
 
-class CommentListView(ListAPIView):
+class CommentListView(SparseFieldsetQuerysetMixin, ConditionalGetMixin, FastListMixin, ListAPIView):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = LimitOffsetPagination
+    pagination_class = CountModePagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['goal']
     ordering = ['-created']
@@ -25,7 +28,9 @@ class CommentCreateView(CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class CommentDetailView(RetrieveUpdateDestroyAPIView):
+class CommentDetailView(
+    BoardAccessQuerysetMixin, SparseFieldsetQuerysetMixin, ConditionalGetMixin, RetrieveUpdateDestroyAPIView
+):
     serializer_class = CommentSerializer
     permission_classes = [CommentPermission]
 
@@ -1,22 +1,33 @@
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, permissions
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework import exceptions, filters, permissions, serializers
+from rest_framework.generics import CreateAPIView, GenericAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
 
-from goals.filters import GoalDateFilter
-from goals.models import Goal
+from goals.filters import FullTextSearchFilter, GoalDateFilter
+from goals.models import BoardGoalStats, Goal, GoalCategory, GoalComment, GoalQuerySet
+from goals.pagination import LimitOffsetKeysetPagination
 from goals.permissions import GoalPermission
-from goals.serializers import GoalCreateSerializer, GoalSerializer
+from goals.roles import WRITE_ROLES, get_board_roles
+from goals.serializers import (
+    GoalBulkCreateSerializer, GoalBulkUpdateSerializer, GoalCreateSerializer, GoalSerializer
+)
+from goals.views.mixins import (
+    BoardAccessQuerysetMixin, ConditionalGetMixin, FastListMixin, SparseFieldsetQuerysetMixin
+)
 
 
-class GoalListView(ListAPIView):
+class GoalListView(SparseFieldsetQuerysetMixin, ConditionalGetMixin, FastListMixin, ListAPIView):
     serializer_class = GoalSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = LimitOffsetPagination
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    pagination_class = LimitOffsetKeysetPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_class = GoalDateFilter
     ordering_fields = ['title', 'created', 'priority', 'due_date']
     search_fields = ['title']
+    search_vector_field = 'search_vector'
 
     def get_queryset(self):
         return (
@@ -31,7 +42,118 @@ class GoalCreateView(CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class GoalDetailView(RetrieveUpdateDestroyAPIView):
+class GoalBulkCreateView(GenericAPIView):
+    """
+    Create a list of goals in one request.
+
+    Every goal is validated on its own, categories are loaded with one query and the user's roles
+    are resolved once, so the cost per goal is the validation and its share of a multi-row `INSERT`.
+    Valid goals are created even if others fail; the response lists the IDs of the created goals
+    in request order and the errors by goal index.
+    """
+
+    serializer_class = GoalBulkCreateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    max_goals = 10000
+    batch_size = 1000
+
+    def post(self, request: Request, *args, **kwargs) -> Response:
+        items = request.data
+        if not isinstance(items, list):
+            raise serializers.ValidationError({'non_field_errors': ['Expected a list of goals.']})
+        if len(items) > self.max_goals:
+            raise serializers.ValidationError(
+                {'non_field_errors': [f'Ensure there are no more than {self.max_goals} goals.']}
+            )
+
+        serializer = self.get_serializer()
+        serializer.context['categories'] = self.get_categories(items)
+        goals, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                validated_data = serializer.run_validation(item)
+            except serializers.ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+                continue
+            goals.append(Goal(**validated_data, board_id=validated_data['category'].board_id))
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(goals, batch_size=self.batch_size)
+            BoardGoalStats.record_changes((None, (goal.board_id, goal.status, goal.priority)) for goal in goals)
+
+        return Response(
+            {'created': [goal.pk for goal in goals], 'errors': errors},
+            status=HTTP_201_CREATED if goals or not errors else HTTP_400_BAD_REQUEST,
+        )
+
+    @staticmethod
+    def get_categories(items: list) -> dict[int, GoalCategory]:
+        category_ids = set()
+        for item in items:
+            try:
+                category_ids.add(int(item['category']))
+            except (KeyError, TypeError, ValueError):
+                pass
+        return GoalCategory.objects.in_bulk(category_ids)
+
+
+class GoalBulkUpdateView(GenericAPIView):
+    """
+    Change the status, priority or category of many goals in one request.
+
+    Goals are selected by `ids` or by a `filter` with the `goal/list` filter parameters.
+    Write access is checked once per board from the user's role map: listed goals on boards
+    without it fail the request, a filter only matches goals on writable boards and must name
+    the categories. The change is applied with set-based statements: filtered goals are locked, counted
+    for the board statistics and updated through a subquery, their primary keys are never listed.
+    """
+
+    serializer_class = GoalBulkUpdateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Goal.objects.filter(category__is_deleted=False).exclude(status=Goal.Status.archived)
+
+    def patch(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        goals = self.get_goals(serializer.validated_data)
+
+        changes = dict(serializer.validated_data['patch'])
+        category = changes.get('category')
+        with transaction.atomic():
+            if category is not None:
+                # Goals moved to another board take their comments with them
+                changes['board_id'] = category.board_id
+                GoalComment.objects.filter(goal__in=goals.values('pk')).exclude(board_id=category.board_id).update(
+                    board_id=category.board_id
+                )
+            updated = goals.update_goals(**changes)
+        return Response({'updated': updated})
+
+    def get_goals(self, data: dict) -> GoalQuerySet:
+        roles = get_board_roles(self.request)
+        if 'filter' in data:
+            writable_boards = [board_id for board_id, role in roles.items() if role in WRITE_ROLES]
+            filterset = GoalDateFilter(
+                data['filter'], queryset=self.get_queryset().filter(board_id__in=writable_boards), request=self.request
+            )
+            if not filterset.is_valid():
+                raise serializers.ValidationError({'filter': filterset.errors})
+            return filterset.qs
+
+        goal_boards = dict(self.get_queryset().filter(pk__in=data['ids']).values_list('pk', 'board_id'))
+        missing = sorted(set(data['ids']) - goal_boards.keys())
+        if missing:
+            raise exceptions.NotFound(f'Goals not found: {", ".join(map(str, missing))}')
+        if any(roles.get(board_id) not in WRITE_ROLES for board_id in set(goal_boards.values())):
+            raise exceptions.PermissionDenied('You do not have permission to update these goals.')
+        return Goal.objects.filter(pk__in=list(goal_boards))
+
+
+class GoalDetailView(
+    BoardAccessQuerysetMixin, SparseFieldsetQuerysetMixin, ConditionalGetMixin, RetrieveUpdateDestroyAPIView
+):
     serializer_class = GoalSerializer
     permission_classes = [GoalPermission]
 
@@ -0,0 +1,135 @@
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from goals.permissions import BoardRolePermission
+from goals.representation import ValuesRepresentation
+from goals.serializers import get_sparse_fields
+
+
+class BoardAccessQuerysetMixin:
+    """
+    Detail view mixin that resolves `BoardRolePermission` checks inside the object query,
+    so a request costs one query instead of a fetch plus a permission lookup.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        for permission in self.get_permissions():
+            if isinstance(permission, BoardRolePermission):
+                queryset = permission.annotate_queryset(queryset, self.request)
+        return queryset
+
+
+class SparseFieldsetQuerysetMixin:
+    """
+    Loads only the columns behind the `?fields=` / `?omit=` selection of a `SparseFieldsetsMixin` serializer.
+
+    `select_related()` is dropped when `user` is not selected, and when every selected field maps to a column,
+    the queryset is limited to those columns plus the primary key, the ordering and `sparse_required_fields`.
+    """
+
+    # Read by permissions, pagination and conditional GET even when not rendered
+    sparse_required_fields = ('board', 'created', 'updated')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if get_sparse_fields(self.request, []) is None:
+            return queryset
+
+        sources = {field.source for field in self.get_serializer().fields.values()}
+        if 'user' not in sources:
+            queryset = queryset.select_related(None)
+
+        columns = {field.name for field in queryset.model._meta.concrete_fields}
+        if not sources <= columns:
+            # Other fields may read anything from the object
+            return queryset
+        ordering = {
+            name.lstrip('-') for name in queryset.query.order_by
+            if isinstance(name, str) and LOOKUP_SEP not in name
+        }
+        return queryset.only(
+            queryset.model._meta.pk.name, *sources, *(ordering & columns), *(set(self.sparse_required_fields) & columns)
+        )
+
+
+class ConditionalGetMixin:
+    """
+    `ETag` / `Last-Modified` support for list and detail views of `BaseModel` objects.
+
+    A list is validated by `MAX(updated)` and `COUNT(*)` of the filtered queryset, an object by its `updated`.
+    When the client's copy is still current, the view answers 304 before anything is serialized.
+    """
+
+    def get_etag(self, request: Request, *parts) -> str:
+        # The representation also depends on the user, the query string and the negotiated format
+        key = '|'.join(map(str, (request.user.pk, request.get_full_path(), request.accepted_media_type, *parts)))
+        return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+    def get_list_validators(self, request: Request, queryset: QuerySet) -> tuple[str, datetime | None]:
+        aggregate = queryset.order_by().aggregate(last_modified=Max('updated'), count=Count('pk'))
+        last_modified = aggregate['last_modified']
+        return self.get_etag(request, last_modified and last_modified.isoformat(), aggregate['count']), last_modified
+
+    def get_object_validators(self, request: Request, obj) -> tuple[str, datetime]:
+        return self.get_etag(request, obj.pk, obj.updated.isoformat()), obj.updated
+
+    def conditional_response(self, request: Request, etag: str, last_modified: datetime | None) -> Response | None:
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified and int(last_modified.timestamp())
+        )
+        if not_modified is None:
+            return None
+        return self.with_validators(Response(status=not_modified.status_code), etag, last_modified)
+
+    @staticmethod
+    def with_validators(response: Response, etag: str, last_modified: datetime | None) -> Response:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        validators = self.get_list_validators(request, self.filter_queryset(self.get_queryset()))
+        response = self.conditional_response(request, *validators)
+        if response is None:
+            response = self.with_validators(super().list(request, *args, **kwargs), *validators)
+        return response
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        instance = self.get_object()
+        validators = self.get_object_validators(request, instance)
+        response = self.conditional_response(request, *validators)
+        if response is None:
+            response = self.with_validators(Response(self.get_serializer(instance).data), *validators)
+        return response
+
+
+class FastListMixin:
+    """
+    List view mixin that renders pages from `values()` rows with `ValuesRepresentation`
+    instead of serializing model instances field by field.
+
+    The output is the same as the serializer's. Views turn it off with `fast_list = False`,
+    and serializers with fields that need model instances fall back to the regular path.
+    """
+
+    fast_list = True
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        representation = ValuesRepresentation.from_serializer(self.get_serializer()) if self.fast_list else None
+        if representation is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*representation.lookups)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(representation.to_representation(page))
+        return Response(representation.to_representation(queryset))
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from bot.management.commands.runbot import Command
+from bot.models import TgUser
+from bot.tg.dispatcher import Lane
+from bot.tg.engine import AsyncBotEngine
+from bot.tg.scheme import GetUpdatesResponse, Message, Update
+
+
+class FakeClient:
+    """Serves the given update batches, then stops the engine."""
+
+    def __init__(self, batches, stop):
+        self.batches = list(batches)
+        self.stop = stop
+
+    async def get_updates(self, offset=0, timeout=30):
+        batch = self.batches.pop(0)
+        if not self.batches:
+            self.stop.set()
+        return GetUpdatesResponse(ok=True, result=batch)
+
+
+def make_update(update_id, chat_id, text):
+    return {'update_id': update_id, 'message': {'message_id': update_id, 'chat': {'id': chat_id}, 'text': text}}
+
+
+class TestAsyncBotEngine:
+
+    def test_async_engine_chat_order(self):
+        handled_in = set()
+        handled = []
+
+        def handler(update: Update) -> None:
+            message = update.message
+            handled_in.add(threading.current_thread().name)
+            if message.chat.id == 1:
+                time.sleep(0.2)
+            # list.append is atomic, the handlers run in several threads
+            handled.append((message.chat.id, f'{message.chat.id}:{message.text}'))
+
+        batches = [
+            [make_update(1, 1, 'a'), make_update(2, 2, 'a'), make_update(3, 1, 'b')],
+            [make_update(4, 2, 'b'), make_update(5, 3, 'a'), make_update(6, 1, 'c')],
+        ]
+
+        async def run():
+            stop = asyncio.Event()
+            client = FakeClient(batches, stop)
+            await AsyncBotEngine(client, handler, workers=4).run(stop)
+
+        asyncio.run(run())
+        assert len(handled) == 6, 'Обработаны не все сообщения'
+        for chat_id, texts in [(1, ['a', 'b', 'c']), (2, ['a', 'b']), (3, ['a'])]:
+            assert [text for chat, text in handled if chat == chat_id] == [f'{chat_id}:{text}' for text in texts], \
+                f'Нарушен порядок сообщений чата {chat_id}'
+        assert handled.index((1, '1:a')) > handled.index((3, '3:a')), 'Медленный чат задерживает остальные'
+        assert all(name.startswith('tg-handler') for name in handled_in), 'Обработчик выполнен вне пула потоков'
+
+    @pytest.mark.django_db
+    def test_runbot_respond(self):
+        message = Message(message_id=1, chat={'id': 42, 'username': 'user'}, text='/goals')
+        reply, lane = Command().respond(message)
+        tg_user = TgUser.objects.get(tg_id=42)
+        assert tg_user.verification_code in reply.text, 'Не выдан код подтверждения'
+        assert lane == Lane.urgent, 'Код подтверждения не в приоритетной очереди'
@@ -0,0 +1,80 @@
+import datetime
+
+import pytest
+from bot.management.commands.runbot import Command
+from bot.models import TgUser
+from bot.tg.bot import get_goals_page, get_user_goals
+from bot.tg.dispatcher import MAX_MESSAGE_LENGTH
+from bot.tg.scheme import CallbackQuery
+from factories import BoardParticipantFactory, CategoryFactory, GoalFactory
+from goals.models import BoardParticipant, Goal
+
+
+class TestBotGoals:
+
+    @pytest.fixture
+    def category(self):
+        participant = BoardParticipantFactory.create(role=BoardParticipant.Role.owner)
+        return CategoryFactory.create(board=participant.board, user=participant.user)
+
+    @pytest.mark.django_db
+    def test_bot_goals_filters(self, category, django_assert_num_queries):
+        today = datetime.date.today()
+        GoalFactory.create(category=category, title='Поздняя', due_date=today + datetime.timedelta(days=1))
+        GoalFactory.create(category=category, title='Без срока', due_date=None, status=Goal.Status.done)
+        GoalFactory.create(
+            category=category, title='Ранняя', due_date=today, status=Goal.Status.done, priority=Goal.Priority.high
+        )
+        GoalFactory.create(category=category, title='Архивная', status=Goal.Status.archived)
+        GoalFactory.create(title='Чужая')
+
+        with django_assert_num_queries(1):
+            reply = get_user_goals(category.user_id)
+        titles = [line.split(',')[0] for line in reply.text.splitlines()]
+        assert titles == ['1) Ранняя', '2) Поздняя', '3) Без срока'], 'Неверный список целей'
+        assert f'due_date: {today.isoformat()}' in reply.text and reply.reply_markup is None, 'Неверный формат'
+
+        assert get_user_goals(category.user_id, 'done').text.count('\n') == 1, 'Неверный фильтр по статусу'
+        assert get_user_goals(category.user_id, 'done HIGH').text.startswith('1) Ранняя'), 'Неверный фильтр'
+        assert get_user_goals(category.user_id, 'archived').text.startswith('1) Архивная'), 'Не найдены архивные цели'
+        assert get_user_goals(category.user_id, 'urgent').text.startswith('Unknown filter'), 'Неизвестный фильтр'
+        assert get_user_goals(category.user_id, 'critical').text == "You don't have any goals.", 'Неверный пустой ответ'
+
+    @pytest.mark.django_db
+    def test_bot_goals_pages(self, category, django_assert_num_queries):
+        for index in range(60):
+            GoalFactory.create(category=category, title=f'{index:02} ' + 'ц' * 200, priority=Goal.Priority.low)
+        GoalFactory.create(category=category, priority=Goal.Priority.high)
+
+        shown, data = [], None
+        while True:
+            with django_assert_num_queries(1):
+                if data is None:
+                    reply = get_user_goals(category.user_id, 'low')
+                else:
+                    reply = get_goals_page(category.user_id, data)
+            assert len(reply.text) <= MAX_MESSAGE_LENGTH, 'Сообщение длиннее лимита Telegram'
+            shown += reply.text.splitlines()
+            if reply.reply_markup is None:
+                break
+            data = reply.reply_markup['inline_keyboard'][0][0]['callback_data']
+            assert len(data.encode()) <= 64, 'Слишком длинные данные кнопки'
+
+        assert len(shown) == 60, 'Показаны не все цели'
+        assert [line.split(')')[0] for line in shown] == [str(index) for index in range(1, 61)], 'Неверная нумерация'
+        for data in ['other:1', 'goals:0:x:', 'goals:²::', 'goals:0:9:', 'goals:0::15', 'goals:0', 'goals:0:1:1:1']:
+            assert get_goals_page(category.user_id, data) is None, f'Обработаны неверные данные кнопки {data}'
+
+    @pytest.mark.django_db
+    def test_bot_goals_callback(self, category, monkeypatch):
+        TgUser.objects.create(tg_id=42, username='tg_user', verification_code='code', user=category.user)
+        GoalFactory.create_batch(size=3, category=category)
+        command = Command()
+        submitted, answered = [], []
+        monkeypatch.setattr(command.client, 'answer_callback_query', answered.append)
+        monkeypatch.setattr(command.dispatcher, 'submit', lambda **kwargs: submitted.append(kwargs))
+
+        query = CallbackQuery(id='1', message={'message_id': 1, 'chat': {'id': 42}, 'text': 'goals'}, data='goals:2::')
+        command.handle_callback_query(query)
+        assert answered == ['1'], 'Нажатие кнопки не подтверждено'
+        assert [message['text'].split(')')[0] for message in submitted] == ['3'], 'Неверная страница целей'
@@ -0,0 +1,88 @@
+import threading
+
+from bot.tg.dispatcher import MAX_MESSAGE_LENGTH, Lane, OutboundDispatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeClient:
+    def __init__(self):
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_message(self, chat_id, text, reply_markup=None):
+        with self.lock:
+            self.sent.append((chat_id, text))
+        return object()
+
+
+class TestOutboundDispatcher:
+
+    @staticmethod
+    def pop_all(dispatcher, now):
+        """Take the messages ready at `now`, completing every send at once."""
+        messages = []
+        while True:
+            message, wait = dispatcher.pop_ready(now)
+            if message is None:
+                return messages, wait
+            dispatcher.in_flight.discard(message.chat_id)
+            messages.append((message.chat_id, message.text))
+
+    def test_dispatcher_rate_limits(self):
+        clock = FakeClock()
+        dispatcher = OutboundDispatcher(FakeClient(), global_rate=2, chat_rate=1, clock=clock)
+        for chat_id in [1, 2, 3]:
+            dispatcher.submit(chat_id, f'to {chat_id}')
+
+        messages, wait = self.pop_all(dispatcher, clock.now)
+        assert messages == [(1, 'to 1'), (2, 'to 2')], 'Не соблюдён общий лимит'
+        assert wait == 0.5, 'Неверное ожидание общего лимита'
+
+        dispatcher.submit(1, 'again')
+        clock.now = 0.5
+        messages, wait = self.pop_all(dispatcher, clock.now)
+        assert messages == [(3, 'to 3')], 'Не соблюдён лимит чата'
+        assert wait == 0.5, 'Неверное ожидание лимита чата'
+        clock.now = 1
+        assert self.pop_all(dispatcher, clock.now)[0] == [(1, 'again')], 'Сообщение чата не отправлено'
+
+    def test_dispatcher_lanes_and_coalescing(self):
+        clock = FakeClock()
+        dispatcher = OutboundDispatcher(FakeClient(), clock=clock)
+        dispatcher.submit(1, 'first')
+        dispatcher.submit(1, 'second')
+        dispatcher.submit(2, 'long')
+        dispatcher.submit(2, 'x' * MAX_MESSAGE_LENGTH)
+        dispatcher.submit(3, 'code', lane=Lane.urgent)
+
+        messages, _ = self.pop_all(dispatcher, clock.now)
+        assert messages == [(3, 'code'), (1, 'first\n\nsecond'), (2, 'long')], 'Неверный порядок или объединение'
+        clock.now = 1
+        assert self.pop_all(dispatcher, clock.now)[0] == [(2, 'x' * MAX_MESSAGE_LENGTH)], \
+            'Длинное сообщение объединено'
+
+        metrics = dispatcher.get_metrics()
+        assert (metrics.submitted, metrics.coalesced, metrics.max_depth) == (5, 1, 4), 'Неверные метрики'
+        assert metrics.depth == {'urgent': 0, 'normal': 0}, 'Неверная глубина очереди'
+
+    def test_dispatcher_threads(self):
+        client = FakeClient()
+        dispatcher = OutboundDispatcher(client, global_rate=1000, chat_rate=1000, senders=4)
+        dispatcher.start()
+        for index in range(20):
+            dispatcher.submit(index % 3, str(index))
+        dispatcher.close(timeout=5)
+
+        assert not any(thread.is_alive() for thread in dispatcher.threads), 'Потоки не остановлены'
+        for chat_id in range(3):
+            texts = '\n\n'.join(text for chat, text in client.sent if chat == chat_id).split('\n\n')
+            assert texts == [str(index) for index in range(chat_id, 20, 3)], f'Нарушен порядок чата {chat_id}'
+        metrics = dispatcher.get_metrics()
+        assert metrics.sent == len(client.sent) and metrics.failed == 0, 'Неверные метрики отправки'
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+import requests
+from bot.tg import client as client_module
+from bot.tg.client import TgClient
+
+
+def make_response(status_code, data):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(data).encode()
+    return response
+
+
+SENT = {'ok': True, 'result': {'message_id': 1, 'chat': {'id': 1}, 'text': 'text'}}
+
+
+class TestTgClient:
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Client whose requests return the queued outcomes, recording the calls and the retry delays."""
+        client = TgClient('token', retries=3, backoff=1, max_backoff=4)
+        client.outcomes, client.calls, client.delays = [], [], []
+
+        def post(url, json, timeout):
+            client.calls.append((url, json))
+            outcome = client.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(client.session, 'post', post)
+        monkeypatch.setattr(client_module.time, 'sleep', client.delays.append)
+        return client
+
+    def test_tg_client_post_json(self, client):
+        client.outcomes = [make_response(200, SENT)]
+        assert client.send_message(chat_id=1, text='text').ok, 'Сообщение не отправлено'
+        assert client.calls == [('https://api.telegram.org/bottoken/sendMessage', {'chat_id': 1, 'text': 'text'})], \
+            'Неверный запрос'
+
+    def test_tg_client_retries(self, client):
+        client.outcomes = [
+            requests.ConnectionError(),
+            make_response(429, {'ok': False, 'error_code': 429, 'parameters': {'retry_after': 7}}),
+            make_response(502, {'ok': False}),
+            make_response(200, SENT),
+        ]
+        assert client.send_message(chat_id=1, text='text').ok, 'Сообщение не отправлено после повторов'
+        assert len(client.calls) == 4, 'Неверное число попыток'
+        assert client.delays[1] == 7, 'Не учтён retry_after'
+        assert 0 <= client.delays[0] <= 1 and 0 <= client.delays[2] <= 4, 'Задержки вне границ экспоненты'
+
+    def test_tg_client_gives_up(self, client):
+        client.outcomes = [make_response(500, {'ok': False})] * 4
+        assert client.send_message(chat_id=1, text='text') is None, 'Ошибка сервера не обработана'
+        assert len(client.calls) == 4, 'Неверное число попыток'
+
+        client.outcomes = [requests.ReadTimeout()]
+        with pytest.raises(requests.ReadTimeout):
+            client.send_message(chat_id=1, text='text')
+        assert len(client.calls) == 5, 'Неидемпотентный запрос повторён после таймаута чтения'
+
+        client.outcomes = [requests.ReadTimeout(), make_response(200, {'ok': True, 'result': []})]
+        assert client.get_updates().ok, 'getUpdates не повторён после таймаута чтения'
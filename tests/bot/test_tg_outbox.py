@@ -0,0 +1,83 @@
+import io
+import time
+
+import pytest
+import requests
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.status import HTTP_200_OK
+from bot.models import TgOutboxMessage, TgUser
+from bot.tg.client import TgClient
+
+
+class TestTgOutbox:
+
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        """Messages sent to Telegram; chat 13 is unreachable."""
+        sent = []
+
+        def send_message(client, chat_id, text, timeout=None):
+            if chat_id == 13:
+                raise requests.ConnectionError('Telegram is down')
+            assert not TgOutboxMessage.objects.filter(chat_id__in=[chat for chat, _ in sent], sent=None).exists(), \
+                'Отправленное сообщение не отмечено до следующей отправки'
+            sent.append((chat_id, text))
+            return object()
+
+        monkeypatch.setattr(TgClient, 'send_message', send_message)
+        return sent
+
+    @staticmethod
+    def drain(**options):
+        call_command('send_tg_outbox', once=True, stdout=io.StringIO(), **options)
+
+    @pytest.mark.django_db
+    def test_verification_outbox(self, login_client_with_user, sent):
+        client, user = login_client_with_user
+        tg_user = TgUser.objects.create(tg_id=42, username='tg_user', verification_code='code')
+
+        response = client.patch('/bot/verify', {'verification_code': 'code'}, content_type='application/json')
+        assert response.status_code == HTTP_200_OK, f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+        assert not sent, 'Сообщение отправлено в запросе'
+        message = TgOutboxMessage.objects.get(chat_id=tg_user.tg_id)
+        assert message.sent is None, 'Сообщение отмечено отправленным до отправки'
+
+        self.drain()
+        message.refresh_from_db()
+        assert sent == [(42, 'You are successfully verified!')], 'Сообщение не отправлено обработчиком'
+        assert message.sent is not None and message.next_attempt is None, 'Сообщение не отмечено отправленным'
+
+    @pytest.mark.django_db
+    def test_outbox_retries(self, sent):
+        message = TgOutboxMessage.objects.create(chat_id=13, text='text')
+
+        self.drain(max_attempts=2)
+        message.refresh_from_db()
+        assert message.attempts == 1 and message.sent is None, 'Неверное число попыток'
+        assert message.next_attempt is not None and 'Telegram is down' in message.last_error, 'Повтор не назначен'
+
+        TgOutboxMessage.objects.filter(pk=message.pk).update(next_attempt=message.created)
+        self.drain(max_attempts=2)
+        message.refresh_from_db()
+        assert message.attempts == 2 and message.next_attempt is None, 'Сообщение не оставлено после всех попыток'
+        assert not sent, 'Отправлено сообщение недоступному чату'
+
+    @pytest.mark.django_db
+    def test_outbox_lease_expired(self, sent, monkeypatch):
+        send_message = TgClient.send_message
+
+        def slow_send_message(client, chat_id, text, timeout=None):
+            # Retries and backoff outlasting the lease
+            time.sleep(0.1)
+            return send_message(client, chat_id, text, timeout)
+
+        monkeypatch.setattr(TgClient, 'send_message', slow_send_message)
+        first, second = TgOutboxMessage.objects.bulk_create(
+            TgOutboxMessage(chat_id=chat_id, text='text', next_attempt=timezone.now()) for chat_id in [1, 2]
+        )
+        self.drain(lease=0.05)
+        assert sent == [(1, 'text'), (2, 'text')], 'Сообщение отправлено повторно или не отправлено'
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.attempts, second.attempts) == (1, 2), 'Остаток партии не передан следующей аренде'
@@ -0,0 +1,51 @@
+import datetime
+import decimal
+import io
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from config import parsers, renderers
+from config.parsers import ORJSONParser
+from config.renderers import ORJSONRenderer
+
+DATA = {
+    'text': 'Цель номер один\u2028\u2029',
+    'date': datetime.date(2024, 1, 2),
+    'datetime': datetime.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+    'decimal': decimal.Decimal('1.50'),
+    'lazy': gettext_lazy('Доска'),
+    'keys': {1: 'one', 2: None},
+    'nested': [{'big': 2 ** 70}, True, 1.5],
+}
+
+
+class TestORJSON:
+
+    @pytest.mark.parametrize('orjson_installed', [True, False])
+    def test_renderer_same_output(self, monkeypatch, orjson_installed):
+        if not orjson_installed:
+            monkeypatch.setattr(renderers, 'orjson', None)
+
+        for data in [DATA, {key: value for key, value in DATA.items() if key != 'nested'}, [], None]:
+            assert ORJSONRenderer().render(data) == JSONRenderer().render(data), 'Вывод отличается от JSONRenderer'
+        assert ORJSONRenderer().render(DATA, 'application/json; indent=2') == \
+            JSONRenderer().render(DATA, 'application/json; indent=2'), 'Вывод с отступами отличается от JSONRenderer'
+
+    @pytest.mark.parametrize('orjson_installed', [True, False])
+    def test_parser(self, monkeypatch, orjson_installed):
+        if not orjson_installed:
+            monkeypatch.setattr(parsers, 'orjson', None)
+        body = JSONRenderer().render(DATA)
+
+        assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body)), \
+            'Результат отличается от JSONParser'
+        assert ORJSONParser().parse(
+            io.BytesIO('{"text": "Цель"}'.encode('cp1251')), parser_context={'encoding': 'cp1251'}
+        ) == {'text': 'Цель'}, 'Не учитывается кодировка'
+        for body in [b'{"text": ', b'[NaN]', b'\xff']:
+            with pytest.raises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
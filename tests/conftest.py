@@ -12,6 +12,14 @@ register(factories.BoardFactory)
 register(factories.BoardParticipantFactory)
 
 
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Cache shared by the processes, the roles and the list responses are cached across requests in it only"""
+    settings.CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': str(tmp_path)}
+    }
+
+
 @pytest.fixture
 def password():
     return 'f306e7b84a00240677664f503e4d77a60ccf848d746c475add39cea6fb3995a8'
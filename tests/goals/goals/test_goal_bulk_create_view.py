@@ -0,0 +1,70 @@
+import pytest
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+
+from goals.models import BoardGoalStats, Goal
+from factories import CategoryFactory
+
+
+class TestGoalBulkCreateView:
+    COUNT = 50
+
+    @pytest.mark.django_db
+    def test_goal_bulk_create_view(self, client_and_category, django_assert_max_num_queries):
+        client, category = client_and_category
+        data = [
+            {'title': f'Goal {index}', 'category': category.pk, 'priority': Goal.Priority.high}
+            for index in range(self.COUNT)
+        ]
+
+        # session, user, categories, roles, savepoint, insert, board statistics
+        with django_assert_max_num_queries(8):
+            response = client.post('/goals/goal/bulk_create', data=data, content_type='application/json')
+        assert response.status_code is HTTP_201_CREATED, \
+            f'Вернулся код {response.status_code} вместо {HTTP_201_CREATED}'
+        assert response.data['errors'] == [], 'Вернулись ошибки'
+
+        goals = Goal.objects.filter(pk__in=response.data['created']).order_by('pk')
+        assert [goal.title for goal in goals] == [item['title'] for item in data], 'Неверные цели'
+        assert all(goal.board_id == category.board_id and goal.user == category.user for goal in goals), \
+            'Неверная доска или автор цели'
+        stats = BoardGoalStats.objects.get(board=category.board)
+        assert stats.status_to_do == stats.priority_high == self.COUNT, 'Статистика доски не обновилась'
+
+    @pytest.mark.django_db
+    def test_goal_bulk_create_view_errors(self, client_and_category, big_pk):
+        client, category = client_and_category
+        not_user_category = CategoryFactory.create()
+        deleted_category = CategoryFactory.create(user=category.user, board=category.board, is_deleted=True)
+
+        response = client.post(
+            '/goals/goal/bulk_create',
+            data={'title': 'Goal', 'category': category.pk},
+            content_type='application/json'
+        )
+        assert response.status_code == HTTP_400_BAD_REQUEST, \
+            f'Вернулся код {response.status_code} вместо {HTTP_400_BAD_REQUEST}'
+
+        data = [
+            {'title': 'Goal', 'category': category.pk},
+            {'title': '', 'category': category.pk},
+            {'title': 'Goal', 'category': not_user_category.pk},
+            {'title': 'Goal', 'category': deleted_category.pk},
+            {'title': 'Goal', 'category': big_pk},
+            {'title': 'Goal', 'category': 'abc'},
+            'Goal',
+        ]
+        response = client.post('/goals/goal/bulk_create', data=data, content_type='application/json')
+        assert response.status_code is HTTP_201_CREATED, \
+            f'Вернулся код {response.status_code} вместо {HTTP_201_CREATED}'
+        assert len(response.data['created']) == 1, 'Неверное количество созданных целей'
+        assert [error['index'] for error in response.data['errors']] == list(range(1, len(data))), \
+            'Ошибки не сопоставлены целям'
+        for error in response.data['errors'][:-1]:
+            expected = {'title'} if error['index'] == 1 else {'category'}
+            assert set(error['errors']) == expected, \
+                f'Неверная ошибка для цели {error["index"]}'
+
+        response = client.post('/goals/goal/bulk_create', data=data[1:], content_type='application/json')
+        assert response.status_code == HTTP_400_BAD_REQUEST, \
+            f'Вернулся код {response.status_code} вместо {HTTP_400_BAD_REQUEST}'
+        assert response.data['created'] == [], 'Созданы цели с ошибками'
@@ -0,0 +1,93 @@
+import pytest
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND
+
+from goals.models import BoardGoalStats, BoardParticipant, Goal
+from factories import BoardParticipantFactory, CategoryFactory, CommentFactory, GoalFactory
+
+
+class TestGoalBulkUpdateView:
+    COUNT = 5
+
+    def patch(self, client, data, status=HTTP_200_OK):
+        response = client.patch('/goals/goal/bulk_update', data=data, content_type='application/json')
+        assert response.status_code == status, \
+            f'Вернулся код {response.status_code} вместо {status}'
+        return response.data
+
+    @pytest.mark.django_db
+    def test_goal_bulk_update_by_ids(self, client_and_category):
+        client, category = client_and_category
+        goals = GoalFactory.create_batch(size=self.COUNT, category=category, user=category.user)
+        ids = [goal.pk for goal in goals[:3]]
+
+        data = self.patch(client, {'ids': ids, 'patch': {'status': Goal.Status.done}})
+        assert data['updated'] == 3, 'Неверное количество обновленных целей'
+        for goal in goals:
+            old_updated = goal.updated
+            goal.refresh_from_db()
+            expected = Goal.Status.done if goal.pk in ids else Goal.Status.to_do
+            assert goal.status == expected, 'Неверный статус цели'
+            assert (goal.updated > old_updated) is (goal.pk in ids), 'Неверная дата обновления'
+
+        stats = BoardGoalStats.objects.get(board=category.board)
+        assert (stats.status_done, stats.status_to_do) == (3, 2), 'Статистика доски не обновилась'
+
+    @pytest.mark.django_db
+    def test_goal_bulk_update_by_filter(self, client_and_category):
+        client, category = client_and_category
+        goals = GoalFactory.create_batch(size=self.COUNT, category=category, user=category.user)
+        comment = CommentFactory.create(goal=goals[0], user=category.user)
+        not_user_goal = GoalFactory.create()
+        other_category = CategoryFactory.create(user=category.user)
+        BoardParticipantFactory.create(
+            user=category.user, board=other_category.board, role=BoardParticipant.Role.writer
+        )
+
+        data = self.patch(client, {'filter': {'category': category.pk}, 'patch': {'category': other_category.pk}})
+        assert data['updated'] == self.COUNT, 'Неверное количество обновленных целей'
+        assert all(
+            goal.category_id == other_category.pk and goal.board_id == other_category.board_id
+            for goal in Goal.objects.filter(pk__in=[goal.pk for goal in goals])
+        ), 'Цели не перенесены в другую категорию'
+        comment.refresh_from_db()
+        assert comment.board_id == other_category.board_id, 'Доска комментария не обновилась'
+        assert BoardGoalStats.objects.get(board=category.board).status_to_do == 0, 'Цели остались на старой доске'
+        assert BoardGoalStats.objects.get(board=other_category.board).status_to_do == self.COUNT, \
+            'Цели не учтены на новой доске'
+
+        self.patch(client, {'filter': {}, 'patch': {'priority': Goal.Priority.critical}}, HTTP_400_BAD_REQUEST)
+        self.patch(
+            client, {'filter': {'status': Goal.Status.to_do}, 'patch': {'priority': Goal.Priority.critical}},
+            HTTP_400_BAD_REQUEST,
+        )
+        data = self.patch(client, {
+            'filter': {'category__in': f'{other_category.pk},{not_user_goal.category_id}'},
+            'patch': {'priority': Goal.Priority.critical},
+        })
+        assert data['updated'] == self.COUNT, 'Изменены чужие цели'
+        not_user_goal.refresh_from_db()
+        assert not_user_goal.priority == Goal.Priority.low, 'Изменена чужая цель'
+
+    @pytest.mark.django_db
+    def test_goal_bulk_update_errors(self, client_and_category, big_pk):
+        client, category = client_and_category
+        goal = GoalFactory.create(category=category, user=category.user)
+        not_user_goal = GoalFactory.create()
+        not_user_category = CategoryFactory.create()
+
+        for data in [
+            {'ids': [goal.pk]},
+            {'ids': [goal.pk], 'patch': {}},
+            {'patch': {'status': Goal.Status.done}},
+            {'ids': [goal.pk], 'filter': {}, 'patch': {'status': Goal.Status.done}},
+            {'ids': [goal.pk], 'patch': {'status': 100}},
+            {'filter': {'status': 100}, 'patch': {'status': Goal.Status.done}},
+        ]:
+            self.patch(client, data, HTTP_400_BAD_REQUEST)
+
+        self.patch(client, {'ids': [goal.pk, big_pk], 'patch': {'status': Goal.Status.done}}, HTTP_404_NOT_FOUND)
+        self.patch(client, {'ids': [not_user_goal.pk], 'patch': {'status': Goal.Status.done}}, HTTP_403_FORBIDDEN)
+        self.patch(client, {'ids': [goal.pk], 'patch': {'category': not_user_category.pk}}, HTTP_403_FORBIDDEN)
+
+        goal.refresh_from_db()
+        assert goal.status == Goal.Status.to_do, 'Цель изменена запросом с ошибкой'
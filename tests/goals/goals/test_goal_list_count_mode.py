@@ -0,0 +1,69 @@
+import pytest
+from rest_framework.status import HTTP_200_OK
+from factories import GoalFactory
+from goals.pagination import CountModePagination
+
+
+class TestGoalListCountMode:
+    COUNT = 7
+    PAGE_SIZE = 2
+    CAP = 3
+
+    @pytest.fixture
+    def get_data(self, client_and_category, monkeypatch):
+        monkeypatch.setattr(CountModePagination, 'count_cap', self.CAP)
+        client, category = client_and_category
+        goals = GoalFactory.create_batch(category=category, user=category.user, size=self.COUNT)
+        return client, goals
+
+    def get(self, client, params):
+        response = client.get('/goals/goal/list', {'limit': self.PAGE_SIZE, **params})
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код  {response.status_code} вместо {HTTP_200_OK}'
+        return response.data
+
+    @pytest.mark.django_db
+    def test_goal_list_capped_count(self, get_data, response_keys):
+        client, goals = get_data
+
+        data = self.get(client, {'count_mode': 'capped'})
+        assert set(data.keys()) == response_keys | {'count_mode'}, 'Ключи ответа не сходятся'
+        assert data['count_mode'] == 'capped', 'Неверный режим подсчета'
+        assert data['count'] == self.CAP, 'Количество не ограничено'
+        assert data['next'] is not None, 'Нет ссылки на следующую страницу'
+
+        data = self.get(client, {'count_mode': 'capped', 'offset': self.PAGE_SIZE})
+        assert data['count_mode'] == 'capped', 'Неверный режим подсчета'
+        assert data['count'] == self.PAGE_SIZE * 2 + 1, 'Неверная нижняя граница количества'
+        assert data['next'] is not None, 'Нет ссылки на следующую страницу'
+
+        data = self.get(client, {'count_mode': 'capped', 'offset': self.COUNT - 1})
+        assert data['count_mode'] == 'exact', 'На последней странице количество должно быть точным'
+        assert data['count'] == self.COUNT, 'Неверное количество записей'
+        assert data['next'] is None, 'Есть ссылка на следующую страницу'
+
+    @pytest.mark.django_db
+    def test_goal_list_estimated_count(self, get_data):
+        client, goals = get_data
+
+        data = self.get(client, {'count_mode': 'estimated'})
+        assert data['count_mode'] in ('estimated', 'exact'), 'Неверный режим подсчета'
+        assert data['count'] >= self.PAGE_SIZE + 1, 'Оценка меньше известного количества'
+        assert len(data['results']) == self.PAGE_SIZE, 'Вернулось не то количество элементов'
+
+    @pytest.mark.django_db
+    def test_goal_list_underestimated_count(self, get_data, monkeypatch):
+        client, goals = get_data
+        monkeypatch.setattr(CountModePagination, 'estimate_count', lambda pagination, queryset: 1)
+
+        data = self.get(client, {'count_mode': 'estimated'})
+        assert data['count_mode'] == 'estimated', 'Неверный режим подсчета'
+        assert data['count'] == self.CAP, 'Подсчет не ограничен при заниженной оценке'
+
+    @pytest.mark.django_db
+    def test_goal_list_exact_count(self, get_data, response_keys):
+        client, goals = get_data
+
+        data = self.get(client, {})
+        assert set(data.keys()) == response_keys, 'Ключи ответа не сходятся'
+        assert data['count'] == self.COUNT, 'Неверное количество записей'
@@ -0,0 +1,59 @@
+import datetime
+
+import pytest
+from rest_framework.status import HTTP_200_OK, HTTP_404_NOT_FOUND
+from factories import GoalFactory
+from goals.models import Goal
+
+
+class TestGoalListCursorView:
+    COUNT = 7
+    PAGE_SIZE = 3
+
+    @pytest.fixture
+    def get_data(self, client_and_category):
+        client, category = client_and_category
+        goals = GoalFactory.create_batch(category=category, user=category.user, size=self.COUNT)
+        # Одинаковые значения и пустые даты, чтобы проверить сортировку по id и NULL
+        for i, goal in enumerate(goals):
+            goal.priority = i % 2 + 1
+            goal.due_date = None if i % 3 == 0 else datetime.date(2023, 1, i + 1)
+            goal.save()
+        not_user_goals = GoalFactory.create_batch(size=self.COUNT)
+        return client, goals
+
+    def walk(self, client, url, ordering):
+        ids = []
+        response = client.get(url, {'cursor': '', 'limit': self.PAGE_SIZE, 'ordering': ordering})
+        while True:
+            assert response.status_code is HTTP_200_OK, \
+                f'Вернулся код  {response.status_code} вместо {HTTP_200_OK}'
+            assert {'next', 'previous', 'results'} == set(response.data.keys()), 'Ключи ответа не сходятся'
+            ids.extend(item['id'] for item in response.data['results'])
+            if response.data['next'] is None:
+                return ids, response
+            response = client.get(response.data['next'])
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('ordering', ['title', '-created', 'priority', '-priority', 'due_date', '-due_date'])
+    def test_goal_list_cursor_view(self, get_data, ordering):
+        client, goals = get_data
+        ids, last_response = self.walk(client, '/goals/goal/list', ordering)
+
+        tiebreak = '-id' if ordering.startswith('-') else 'id'
+        expected = list(Goal.objects.filter(category=goals[0].category).order_by(ordering, tiebreak)
+                        .values_list('id', flat=True))
+        assert len(ids) == self.COUNT, 'Вернулось не то количество элементов'
+        assert ids == expected, 'Порядок курсорной пагинации не совпадает с обычной сортировкой'
+
+        previous = client.get(last_response.data['previous'])
+        last_page_size = len(last_response.data['results'])
+        assert [item['id'] for item in previous.data['results']] == \
+               ids[-last_page_size - self.PAGE_SIZE:-last_page_size], 'Неверная предыдущая страница'
+
+    @pytest.mark.django_db
+    def test_goal_list_cursor_view_errors(self, get_data):
+        client, goals = get_data
+        response = client.get('/goals/goal/list', {'cursor': 'not-a-cursor'})
+        assert response.status_code is HTTP_404_NOT_FOUND, \
+            f'Вернулся код  {response.status_code} вместо {HTTP_404_NOT_FOUND}'
@@ -0,0 +1,45 @@
+import pytest
+from rest_framework.status import HTTP_200_OK
+from factories import GoalFactory
+
+
+class TestGoalListSearchView:
+    LIMIT = 300
+
+    @pytest.fixture
+    def get_data(self, client_and_category):
+        client, category = client_and_category
+        in_description = GoalFactory.create(
+            category=category, user=category.user, title='Подготовить отчет', description='Собрать задачи спринта'
+        )
+        in_title = GoalFactory.create(
+            category=category, user=category.user, title='Задачи на неделю', description='Список дел'
+        )
+        other = GoalFactory.create(category=category, user=category.user, title='Купить молоко', description='')
+        return client, in_description, in_title, other
+
+    def search(self, client, term):
+        response = client.get('/goals/goal/list', {'limit': self.LIMIT, 'search': term})
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код  {response.status_code} вместо {HTTP_200_OK}'
+        return [item['id'] for item in response.data['results']]
+
+    @pytest.mark.django_db
+    def test_goal_list_search_view(self, get_data):
+        client, in_description, in_title, other = get_data
+
+        assert self.search(client, 'задача') == [in_title.id, in_description.id], \
+            'Совпадение в названии должно быть выше совпадения в описании'
+        assert self.search(client, 'молок') == [other.id], 'Не работает поиск по началу слова'
+        assert self.search(client, 'отчет спринт') == [in_description.id], 'Не работает поиск по нескольким словам'
+        assert self.search(client, '!!!') == [], 'Вернулись данные по пустому запросу'
+
+    @pytest.mark.django_db
+    def test_goal_list_search_view_after_update(self, get_data):
+        client, in_description, in_title, other = get_data
+
+        other.title = 'Позвонить в банк'
+        other.save()
+
+        assert self.search(client, 'молоко') == [], 'Поисковый вектор не обновился после сохранения'
+        assert self.search(client, 'банк') == [other.id], 'Поисковый вектор не обновился после сохранения'
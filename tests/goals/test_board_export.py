@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+
+import pytest
+from django.utils import timezone
+from rest_framework.status import HTTP_200_OK, HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN
+from factories import CategoryFactory, CommentFactory, GoalFactory
+from goals.models import Goal
+
+
+class TestBoardExport:
+
+    @pytest.fixture
+    def get_board(self, client_and_category):
+        client, category = client_and_category
+        goals = GoalFactory.create_batch(size=3, category=category, user=category.user)
+        CommentFactory.create(goal=goals[0], user=category.user)
+        deleted_category = CategoryFactory.create(board=category.board, user=category.user, is_deleted=True)
+        GoalFactory.create(category=deleted_category, user=category.user)
+        archived_goal = GoalFactory.create(category=category, user=category.user, status=Goal.Status.archived)
+        CommentFactory.create(goal=archived_goal, user=category.user)
+        GoalFactory.create()
+        return client, category
+
+    @staticmethod
+    def export(client, board, params):
+        response = client.get(f'/goals/board/{board.pk}/export', params)
+        assert response.status_code == HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+        assert response.streaming, 'Ответ не потоковый'
+        return b''.join(response.streaming_content).decode()
+
+    @pytest.mark.django_db
+    def test_board_export(self, get_board):
+        client, category = get_board
+
+        rows = [json.loads(line) for line in self.export(client, category.board, {}).splitlines()]
+        assert [row['type'] for row in rows] == ['category', 'goal', 'goal', 'goal', 'comment'], \
+            'Неверный состав выгрузки'
+        goal = rows[1]
+        assert goal['category'] == category.pk and goal['user'] == category.user.pk, 'Неверные поля цели'
+        assert goal['created'].endswith('Z'), 'Неверный формат даты'
+
+        csv_rows = list(csv.DictReader(io.StringIO(self.export(client, category.board, {'output': 'csv'}))))
+        assert [row['type'] for row in csv_rows] == [row['type'] for row in rows], 'Выгрузки CSV и NDJSON различаются'
+        assert csv_rows[1]['title'] == goal['title'], 'Неверные поля цели в CSV'
+
+    @pytest.mark.django_db
+    def test_board_export_since(self, get_board):
+        client, category = get_board
+        since = timezone.now()
+        goal = GoalFactory.create(category=category, user=category.user)
+
+        content = self.export(client, category.board, {'since': since.isoformat()})
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert [(row['type'], row['id']) for row in rows] == [('goal', goal.pk)], 'Неверная инкрементальная выгрузка'
+
+        since = timezone.now()
+        response = client.delete(f'/goals/goal/{goal.pk}')
+        assert response.status_code == HTTP_204_NO_CONTENT, \
+            f'Вернулся код {response.status_code} вместо {HTTP_204_NO_CONTENT}'
+        response = client.delete(f'/goals/goal_category/{category.pk}')
+        assert response.status_code == HTTP_204_NO_CONTENT, \
+            f'Вернулся код {response.status_code} вместо {HTTP_204_NO_CONTENT}'
+
+        content = self.export(client, category.board, {'since': since.isoformat()})
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert [(row['type'], row['id']) for row in rows if row['type'] == 'category'] == [('category', category.pk)], \
+            'Удаление категории не попало в выгрузку'
+        assert rows[0]['is_deleted'], 'Категория не помечена удаленной'
+        goal_rows = [row for row in rows if row['type'] == 'goal']
+        assert len(goal_rows) == 4 and all(row['status'] == Goal.Status.archived for row in goal_rows), \
+            'Архивированные цели не попали в выгрузку'
+        full = [json.loads(line) for line in self.export(client, category.board, {}).splitlines()]
+        assert not full, 'Полная выгрузка содержит удаленные объекты'
+
+    @pytest.mark.django_db
+    def test_board_export_errors(self, get_board, client, one_board_owner_writer_reader_alien):
+        authorized_client, category = get_board
+        for params in [{'output': 'xml'}, {'since': 'yesterday'}]:
+            response = authorized_client.get(f'/goals/board/{category.board.pk}/export', params)
+            assert response.status_code == HTTP_400_BAD_REQUEST, \
+                f'Вернулся код {response.status_code} вместо {HTTP_400_BAD_REQUEST}'
+
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        client.force_login(alien)
+        response = client.get(f'/goals/board/{board.pk}/export')
+        assert response.status_code == HTTP_403_FORBIDDEN, \
+            f'Вернулся код {response.status_code} вместо {HTTP_403_FORBIDDEN}'
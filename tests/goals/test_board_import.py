@@ -0,0 +1,131 @@
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN
+from factories import CategoryFactory
+from goals.models import BoardGoalStats, Goal, GoalCategory
+
+
+class TestBoardImport:
+
+    @staticmethod
+    def upload(client, board, name, content, params=''):
+        file = SimpleUploadedFile(name, content.encode())
+        return client.post(f'/goals/board/{board.pk}/import{params}', {'file': file})
+
+    @pytest.mark.django_db
+    def test_board_import_ndjson(self, client_and_category):
+        client, category = client_and_category
+        board = category.board
+        rows = [
+            {'type': 'category', 'title': 'Новая'},
+            {'category': category.title, 'title': 'Цель 1', 'status': 'done', 'priority': 4},
+            {'category': 'Новая', 'title': 'Цель 2', 'due_date': '2030-01-01'},
+            {'category': 'Новая', 'title': '', 'status': 'unknown'},
+            {'category': 'Новая', 'title': 'Цель 3', 'description': ['не', 'строка']},
+        ]
+        content = '\n'.join(json.dumps(row, ensure_ascii=False) for row in rows) + '\n\nnot json\n'
+
+        response = self.upload(client, board, 'goals.ndjson', content)
+        assert response.status_code == HTTP_201_CREATED, \
+            f'Вернулся код {response.status_code} вместо {HTTP_201_CREATED}'
+        report = response.json()
+        assert (report['categories'], report['goals'], report['failed']) == (1, 2, 3), 'Неверный отчёт об импорте'
+        assert [error['line'] for error in report['errors']] == [4, 5, 7], 'Неверные номера строк с ошибками'
+        assert set(report['errors'][0]['errors']) == {'title', 'status'}, 'Неверные ошибки строки'
+        assert list(report['errors'][1]['errors']) == ['description'], 'Неверные ошибки строки'
+
+        goal = Goal.objects.get(title='Цель 1')
+        assert (goal.category_id, goal.status, goal.priority) == (category.pk, Goal.Status.done, Goal.Priority.critical), \
+            'Неверные поля импортированной цели'
+        new_goal = Goal.objects.get(title='Цель 2')
+        assert new_goal.category.title == 'Новая' and new_goal.board_id == board.pk, 'Цель не в новой категории'
+        stats = BoardGoalStats.objects.get(board=board)
+        assert (stats.status_done, stats.status_to_do) == (1, 1), 'Статистика доски не обновлена'
+
+    @pytest.mark.django_db
+    def test_board_import_csv(self, client_and_category):
+        client, category = client_and_category
+        content = (
+            'type,title,category,status,priority,due_date\n'
+            f'goal,Цель CSV,{category.title},in_progress,,\n'
+            'goal,Цель с датой,Другая,,high,2030-13-01\n'
+        )
+
+        response = self.upload(client, category.board, 'goals.txt', content, '?input=csv')
+        assert response.status_code == HTTP_201_CREATED, \
+            f'Вернулся код {response.status_code} вместо {HTTP_201_CREATED}'
+        report = response.json()
+        assert (report['categories'], report['goals'], report['failed']) == (0, 1, 1), 'Неверный отчёт об импорте'
+        assert list(report['errors'][0]['errors']) == ['due_date'], 'Неверные ошибки строки'
+        goal = Goal.objects.get(title='Цель CSV')
+        assert (goal.status, goal.priority) == (Goal.Status.in_progress, Goal.Priority.medium), 'Неверные поля цели'
+        assert not GoalCategory.objects.filter(title='Другая').exists(), 'Создана категория отклонённой строки'
+
+    @pytest.mark.django_db
+    def test_board_import_line_numbers_and_taken_titles(self, client_and_category):
+        client, category = client_and_category
+        other_board_category = CategoryFactory.create()
+        deleted_category = CategoryFactory.create(board=category.board, is_deleted=True)
+        content = (
+            'type,title,category,description\n'
+            '\n'
+            f'goal,Цель 1,{category.title},"две\nстроки"\n'
+            f'category,{other_board_category.title},,\n'
+            '\n'
+            f'goal,Цель 2,{deleted_category.title},\n'
+            'goal,,Новая,\n'
+            'goal,Цель 3,Новая,\n'
+        )
+
+        response = self.upload(client, category.board, 'goals.csv', content)
+        assert response.status_code == HTTP_201_CREATED, \
+            f'Вернулся код {response.status_code} вместо {HTTP_201_CREATED}'
+        report = response.json()
+        assert (report['categories'], report['goals'], report['failed']) == (1, 2, 3), 'Неверный отчёт об импорте'
+        assert sorted(error['line'] for error in report['errors']) == [5, 7, 8], 'Неверные номера строк с ошибками'
+        assert GoalCategory.objects.filter(title=other_board_category.title).count() == 1, \
+            'Создана категория с занятым названием'
+        assert not Goal.objects.filter(title='Цель 2').exists(), 'Цель создана в удаленной категории'
+
+    @pytest.mark.django_db
+    def test_board_import_errors(self, client_and_category, client, one_board_owner_writer_reader_alien):
+        authorized_client, category = client_and_category
+        board = category.board
+        for name, content, params in [
+            ('goals.xml', '<goals/>', ''),
+            ('goals.ndjson', 'not json\n', ''),
+            ('goals.csv', 'title\n', '?input=xml'),
+        ]:
+            response = self.upload(authorized_client, board, name, content, params)
+            assert response.status_code == HTTP_400_BAD_REQUEST, \
+                f'Вернулся код {response.status_code} вместо {HTTP_400_BAD_REQUEST} для {name}'
+
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        client.force_login(writer)
+        response = self.upload(client, board, 'goals.ndjson', '{"type": "category", "title": "Новая"}')
+        assert response.status_code == HTTP_201_CREATED, \
+            f'Вернулся код {response.status_code} вместо {HTTP_201_CREATED}'
+        client.force_login(reader)
+        response = self.upload(client, board, 'goals.ndjson', '{"type": "category", "title": "Новая"}')
+        assert response.status_code == HTTP_403_FORBIDDEN, \
+            f'Вернулся код {response.status_code} вместо {HTTP_403_FORBIDDEN}'
+
+    @pytest.mark.django_db
+    def test_import_goals_command(self, tmp_path, one_board_owner_writer_reader_alien):
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        category = CategoryFactory.create(board=board, user=owner)
+        path = tmp_path / 'goals.csv'
+        path.write_text(
+            'title,category\n' + ''.join(f'Цель {i},{category.title}\n' for i in range(5)) + ',Пустая\n',
+            encoding='utf-8',
+        )
+
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_goals', str(path), board=board.pk, user=owner.username, batch_size=2, stdout=out, stderr=err)
+        assert 'Imported 0 categories and 5 goals, 1 lines failed' in out.getvalue(), 'Неверный итог команды'
+        assert 'Line 7' in err.getvalue(), 'Ошибка строки не выведена'
+        assert Goal.objects.filter(category=category, user=owner).count() == 5, 'Цели не импортированы'
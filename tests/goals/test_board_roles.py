@@ -0,0 +1,138 @@
+import pytest
+from django.test import RequestFactory
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT, HTTP_403_FORBIDDEN
+from factories import CategoryFactory
+from goals.models import BoardParticipant
+from goals.roles import WRITE_ROLES, get_board_role, has_board_role
+
+
+class TestBoardRoles:
+
+    @pytest.mark.django_db
+    def test_board_roles_memoized(self, boards_owner_writer_reader_alien, django_assert_num_queries):
+        general_board, personal_board, owner, writer, reader, alien = boards_owner_writer_reader_alien
+        request = RequestFactory().get('/')
+        request.user = owner
+
+        with django_assert_num_queries(1):
+            assert get_board_role(request, general_board.pk) == BoardParticipant.Role.owner, 'Неверная роль'
+            assert get_board_role(request, str(personal_board.pk)) == BoardParticipant.Role.owner, 'Неверная роль'
+            assert has_board_role(request, general_board.pk, WRITE_ROLES), 'Неверная проверка роли'
+            assert not has_board_role(request, 'not-a-board'), 'Неверная проверка роли'
+
+        request = RequestFactory().get('/')
+        request.user = reader
+        assert not has_board_role(request, general_board.pk, WRITE_ROLES), 'Читатель получил права на запись'
+        assert not has_board_role(request, personal_board.pk), 'Есть доступ к чужой доске'
+
+    @pytest.mark.django_db
+    def test_goal_create_single_role_query(self, client, one_board_owner_writer_reader_alien,
+                                           django_assert_num_queries):
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        category = CategoryFactory.create(user=owner, board=board)
+        client.force_login(writer)
+
+        # session, user, category, roles, insert, board statistics
+        with django_assert_num_queries(6):
+            response = client.post(
+                '/goals/goal/create',
+                data={'title': 'new_title', 'category': category.pk},
+                content_type='application/json'
+            )
+        assert response.status_code is HTTP_201_CREATED, \
+            f'Вернулся код {response.status_code} вместо {HTTP_201_CREATED}'
+
+    @pytest.mark.django_db
+    def test_board_roles_cached_between_requests(self, shared_cache, one_board_owner_writer_reader_alien,
+                                                 django_assert_num_queries):
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        first_request, second_request = RequestFactory().get('/'), RequestFactory().get('/')
+        first_request.user = second_request.user = writer
+
+        with django_assert_num_queries(1):
+            assert has_board_role(first_request, board.pk, WRITE_ROLES), 'Неверная проверка роли'
+            assert has_board_role(second_request, board.pk, WRITE_ROLES), 'Неверная проверка роли'
+
+    @pytest.mark.django_db
+    def test_board_roles_not_cached_in_process(self, one_board_owner_writer_reader_alien,
+                                               django_assert_num_queries):
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        first_request, second_request = RequestFactory().get('/'), RequestFactory().get('/')
+        first_request.user = second_request.user = writer
+
+        with django_assert_num_queries(2):
+            assert has_board_role(first_request, board.pk, WRITE_ROLES), 'Неверная проверка роли'
+            assert has_board_role(second_request, board.pk, WRITE_ROLES), 'Неверная проверка роли'
+
+    @pytest.mark.django_db
+    def test_board_roles_invalidated_by_models(self, shared_cache, one_board_owner_writer_reader_alien):
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        for user in [reader, writer]:
+            request = RequestFactory().get('/')
+            request.user = user
+            assert has_board_role(request, board.pk), 'Нет доступа у участника'
+
+        BoardParticipant.objects.filter(user=reader, board=board).delete()
+        request = RequestFactory().get('/')
+        request.user = reader
+        assert not has_board_role(request, board.pk), 'Удаленный участник сохранил доступ'
+
+        participant = BoardParticipant.objects.get(user=writer, board=board)
+        participant.role = BoardParticipant.Role.reader
+        participant.save()
+        request = RequestFactory().get('/')
+        request.user = writer
+        assert not has_board_role(request, board.pk, WRITE_ROLES), 'Осталась роль до изменения'
+
+        board.is_deleted = True
+        board.save()
+        request = RequestFactory().get('/')
+        request.user = writer
+        assert not has_board_role(request, board.pk), 'Остался доступ к удаленной доске'
+
+    @pytest.mark.django_db
+    def test_board_roles_invalidated(self, shared_cache, client, one_board_owner_writer_reader_alien):
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        category = CategoryFactory.create(user=owner, board=board)
+
+        for user in [reader, writer]:
+            request = RequestFactory().get('/')
+            request.user = user
+            assert has_board_role(request, board.pk), 'Нет доступа у участника'
+
+        client.force_login(alien)
+        response = client.get(f'/goals/goal_category/{category.pk}')
+        assert response.status_code is HTTP_403_FORBIDDEN, \
+            f'Вернулся код {response.status_code} вместо {HTTP_403_FORBIDDEN}'
+
+        client.force_login(owner)
+        response = client.put(
+            f'/goals/board/{board.pk}',
+            data={
+                'title': board.title,
+                'participants': [
+                    {'user': user.username, 'role': role}
+                    for user, role in [(writer, BoardParticipant.Role.writer), (alien, BoardParticipant.Role.reader)]
+                ],
+            },
+            content_type='application/json'
+        )
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+
+        request = RequestFactory().get('/')
+        request.user = reader
+        assert not has_board_role(request, board.pk), 'Удаленный участник сохранил доступ'
+
+        client.force_login(alien)
+        response = client.get(f'/goals/goal_category/{category.pk}')
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+
+        client.force_login(owner)
+        response = client.delete(f'/goals/board/{board.pk}')
+        assert response.status_code is HTTP_204_NO_CONTENT, \
+            f'Вернулся код {response.status_code} вместо {HTTP_204_NO_CONTENT}'
+        request = RequestFactory().get('/')
+        request.user = writer
+        assert not has_board_role(request, board.pk), 'Остался доступ к удаленной доске'
@@ -0,0 +1,124 @@
+import datetime
+
+import pytest
+from rest_framework.status import HTTP_200_OK, HTTP_204_NO_CONTENT, HTTP_403_FORBIDDEN
+from factories import CategoryFactory, GoalFactory
+from goals.models import BoardGoalStats, Goal
+
+
+class TestBoardStats:
+
+    @staticmethod
+    def get_stats(client, board):
+        response = client.get(f'/goals/board/{board.pk}/stats')
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+        return response.data
+
+    @staticmethod
+    def assert_matches_goals(board):
+        stats = BoardGoalStats.objects.get(board=board)
+        expected = BoardGoalStats.refresh([board.pk])[0]
+        for field in [field.name for field in BoardGoalStats._meta.fields if field.name not in ('board', 'updated')]:
+            assert getattr(stats, field) == getattr(expected, field), f'Счетчик {field} разошелся с целями'
+
+    @pytest.mark.django_db
+    def test_board_stats(self, client_and_category):
+        client, category = client_and_category
+        board = category.board
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        GoalFactory.create_batch(size=2, category=category, user=category.user, due_date=yesterday)
+        GoalFactory.create(category=category, user=category.user, priority=Goal.Priority.critical)
+        GoalFactory.create(category=category, user=category.user, status=Goal.Status.done, due_date=yesterday)
+
+        data = self.get_stats(client, board)
+        assert data['total'] == 4, 'Неверное количество активных целей'
+        assert data['by_status'] == {'to_do': 3, 'in_progress': 0, 'done': 1, 'archived': 0}, \
+            'Неверное количество целей по статусам'
+        assert data['by_priority'] == {'low': 3, 'medium': 0, 'high': 0, 'critical': 1}, \
+            'Неверное количество целей по приоритетам'
+        assert data['overdue'] == 2, 'Неверное количество просроченных целей'
+
+    @pytest.mark.django_db
+    def test_board_stats_follow_goal_writes(self, client_and_category):
+        client, category = client_and_category
+        board = category.board
+        goals = GoalFactory.create_batch(size=3, category=category, user=category.user)
+
+        response = client.patch(
+            f'/goals/goal/{goals[0].pk}',
+            data={'status': Goal.Status.in_progress, 'priority': Goal.Priority.high},
+            content_type='application/json'
+        )
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+        response = client.delete(f'/goals/goal/{goals[1].pk}')
+        assert response.status_code is HTTP_204_NO_CONTENT, \
+            f'Вернулся код {response.status_code} вместо {HTTP_204_NO_CONTENT}'
+        self.assert_matches_goals(board)
+
+        other_category = CategoryFactory.create(user=category.user, board=board)
+        goal = GoalFactory.create(category=other_category, user=category.user)
+        goal.category = category
+        goal.save()
+        response = client.delete(f'/goals/goal_category/{other_category.pk}')
+        assert response.status_code is HTTP_204_NO_CONTENT, \
+            f'Вернулся код {response.status_code} вместо {HTTP_204_NO_CONTENT}'
+        self.assert_matches_goals(board)
+
+        response = client.delete(f'/goals/goal_category/{category.pk}')
+        assert response.status_code is HTTP_204_NO_CONTENT, \
+            f'Вернулся код {response.status_code} вместо {HTTP_204_NO_CONTENT}'
+        data = self.get_stats(client, board)
+        assert data['total'] == 0, 'Остались активные цели в удаленной категории'
+        assert data['by_status']['archived'] == 4, 'Неверное количество целей в архиве'
+        self.assert_matches_goals(board)
+
+    @pytest.mark.django_db
+    def test_board_stats_goal_moved_between_boards(self, client_and_category):
+        client, category = client_and_category
+        goal = GoalFactory.create(category=category, user=category.user)
+        other_category = CategoryFactory.create(user=category.user)
+
+        goal.category = other_category
+        goal.save()
+        self.assert_matches_goals(category.board)
+        self.assert_matches_goals(other_category.board)
+        assert BoardGoalStats.objects.get(board=other_category.board).status_to_do == 1, \
+            'Цель не учтена на новой доске'
+
+    @pytest.mark.django_db
+    def test_board_stats_stale_goal_writes(self, client_and_category):
+        client, category = client_and_category
+        goal = GoalFactory.create(category=category, user=category.user)
+        first, second = Goal.objects.get(pk=goal.pk), Goal.objects.get(pk=goal.pk)
+
+        first.status = Goal.Status.done
+        first.save()
+        # Loaded before the first write, still to_do
+        second.priority = Goal.Priority.high
+        second.save(update_fields=['priority'])
+        self.assert_matches_goals(category.board)
+
+        second.status = Goal.Status.in_progress
+        second.save()
+        Goal.objects.filter(pk=goal.pk).update_goals(priority=Goal.Priority.low)
+        Goal.objects.filter(category=category).archive()
+        self.assert_matches_goals(category.board)
+        assert BoardGoalStats.objects.get(board=category.board).status_archived == 1, \
+            'Неверное количество целей в архиве'
+
+    @pytest.mark.django_db
+    def test_board_stats_permission(self, client, one_board_owner_writer_reader_alien, django_assert_num_queries):
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        GoalFactory.create(category=CategoryFactory.create(user=owner, board=board), user=owner)
+
+        client.force_login(reader)
+        # session, user, board with stats and the permission subquery, overdue count
+        with django_assert_num_queries(4):
+            self.get_stats(client, board)
+
+        client.force_login(alien)
+        response = client.get(f'/goals/board/{board.pk}/stats')
+        assert response.status_code is HTTP_403_FORBIDDEN, \
+            f'Вернулся код {response.status_code} вместо {HTTP_403_FORBIDDEN}'
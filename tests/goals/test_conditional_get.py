@@ -0,0 +1,44 @@
+import pytest
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+from factories import GoalFactory
+
+
+class TestConditionalGet:
+
+    @staticmethod
+    def get(client, url, status=HTTP_200_OK, **headers):
+        response = client.get(url, headers=headers)
+        assert response.status_code == status, \
+            f'Вернулся код {response.status_code} вместо {status} для {url}'
+        return response
+
+    @pytest.mark.django_db
+    def test_conditional_get(self, client_and_goal):
+        client, goal = client_and_goal
+        category, board = goal.category, goal.category.board
+
+        for url in [
+            '/goals/board/list', f'/goals/board/{board.pk}',
+            '/goals/goal_category/list', f'/goals/goal_category/{category.pk}',
+            '/goals/goal/list', f'/goals/goal/{goal.pk}',
+        ]:
+            response = self.get(client, url)
+            etag, last_modified = response['ETag'], response['Last-Modified']
+
+            response = self.get(client, url, HTTP_304_NOT_MODIFIED, If_None_Match=etag)
+            assert not response.content, f'Тело ответа не пустое для {url}'
+            assert response['ETag'] == etag, f'Неверный ETag для {url}'
+            self.get(client, url, HTTP_304_NOT_MODIFIED, If_Modified_Since=last_modified)
+            self.get(client, url + '?limit=1', If_None_Match=etag)
+
+    @pytest.mark.django_db
+    def test_conditional_get_changed(self, client_and_goal):
+        client, goal = client_and_goal
+
+        for change in [
+            lambda: client.patch(f'/goals/goal/{goal.pk}', data={'title': 'new'}, content_type='application/json'),
+            lambda: GoalFactory.create(category=goal.category, user=goal.user),
+        ]:
+            etag = self.get(client, '/goals/goal/list')['ETag']
+            change()
+            assert self.get(client, '/goals/goal/list', If_None_Match=etag)['ETag'] != etag, 'ETag не изменился'
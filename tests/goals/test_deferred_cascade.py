@@ -0,0 +1,65 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from rest_framework.status import HTTP_204_NO_CONTENT
+from factories import CategoryFactory, GoalFactory
+from goals.models import BoardGoalStats, CascadeJob, Goal
+
+
+class TestDeferredCascade:
+
+    @staticmethod
+    def run_worker(batch_size):
+        out = io.StringIO()
+        call_command('run_cascades', once=True, batch_size=batch_size, stdout=out)
+        return out.getvalue()
+
+    @pytest.mark.django_db
+    def test_deferred_board_cascade(self, client_and_category, settings):
+        client, category = client_and_category
+        settings.DEFERRED_CASCADE = True
+        board = category.board
+        other_category = CategoryFactory.create(board=board, user=category.user)
+        GoalFactory.create_batch(size=3, category=category, user=category.user)
+        GoalFactory.create_batch(size=2, category=other_category, user=category.user)
+        GoalFactory.create(category=category, user=category.user, status=Goal.Status.archived)
+        other_goal = GoalFactory.create()
+
+        response = client.delete(f'/goals/board/{board.pk}')
+        assert response.status_code == HTTP_204_NO_CONTENT, \
+            f'Вернулся код {response.status_code} вместо {HTTP_204_NO_CONTENT}'
+        assert Goal.objects.filter(board=board, status=Goal.Status.archived).count() == 1, \
+            'Цели архивированы в запросе'
+        assert not Goal.objects.filter(board=board, category__is_deleted=False).exists(), 'Категории не удалены'
+        job = CascadeJob.objects.get(board=board)
+        assert job.finished is None, 'Задание завершено до запуска обработчика'
+
+        output = self.run_worker(batch_size=2)
+        assert output.count('\n') == 3, 'Неверное число пакетов'
+        job.refresh_from_db()
+        assert (job.total, job.processed) == (5, 5) and job.finished is not None, 'Неверный прогресс задания'
+        assert Goal.objects.filter(board=board).exclude(status=Goal.Status.archived).count() == 0, \
+            'Цели не архивированы'
+        other_goal.refresh_from_db()
+        assert other_goal.status != Goal.Status.archived, 'Архивирована цель другой доски'
+        assert BoardGoalStats.objects.get(board=board).status_archived == 6, 'Статистика доски не обновлена'
+        assert self.run_worker(batch_size=2) == '', 'Завершённое задание обработано повторно'
+
+    @pytest.mark.django_db
+    def test_deferred_category_cascade(self, client_and_category, settings):
+        client, category = client_and_category
+        settings.DEFERRED_CASCADE = True
+        goals = GoalFactory.create_batch(size=2, category=category, user=category.user)
+        kept_goal = GoalFactory.create(category=CategoryFactory.create(board=category.board, user=category.user))
+
+        response = client.delete(f'/goals/goal_category/{category.pk}')
+        assert response.status_code == HTTP_204_NO_CONTENT, \
+            f'Вернулся код {response.status_code} вместо {HTTP_204_NO_CONTENT}'
+        assert CascadeJob.objects.filter(category=category).exists(), 'Задание не создано'
+
+        self.run_worker(batch_size=10)
+        statuses = set(Goal.objects.filter(pk__in=[goal.pk for goal in goals]).values_list('status', flat=True))
+        assert statuses == {Goal.Status.archived}, 'Цели категории не архивированы'
+        kept_goal.refresh_from_db()
+        assert kept_goal.status != Goal.Status.archived, 'Архивирована цель другой категории'
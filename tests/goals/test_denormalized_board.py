@@ -0,0 +1,39 @@
+import pytest
+from rest_framework.status import HTTP_200_OK
+from factories import BoardParticipantFactory, CategoryFactory
+from goals.models import BoardParticipant
+
+
+class TestDenormalizedBoard:
+
+    @pytest.mark.django_db
+    def test_goal_and_comment_board(self, client_and_comment):
+        client, comment = client_and_comment
+        goal = comment.goal
+
+        goal.refresh_from_db()
+        comment.refresh_from_db()
+        assert goal.board_id == goal.category.board_id, 'Доска цели не совпадает с доской категории'
+        assert comment.board_id == goal.board_id, 'Доска комментария не совпадает с доской цели'
+
+    @pytest.mark.django_db
+    def test_goal_moved_to_another_board(self, client_and_comment):
+        client, comment = client_and_comment
+        goal = comment.goal
+        other_category = CategoryFactory.create(user=goal.user)
+        BoardParticipantFactory.create(
+            user=goal.user, board=other_category.board, role=BoardParticipant.Role.owner
+        )
+
+        response = client.patch(
+            f'/goals/goal/{goal.pk}',
+            data={'category': other_category.pk},
+            content_type='application/json'
+        )
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+
+        goal.refresh_from_db()
+        comment.refresh_from_db()
+        assert goal.board_id == other_category.board_id, 'Доска цели не обновилась при смене категории'
+        assert comment.board_id == other_category.board_id, 'Доска комментария не обновилась при смене категории'
@@ -0,0 +1,37 @@
+import pytest
+from rest_framework.status import HTTP_200_OK, HTTP_403_FORBIDDEN
+from factories import CategoryFactory, CommentFactory, GoalFactory
+
+
+class TestDetailViewQueries:
+    # session + user + object with the permission subquery
+    QUERIES = 3
+
+    @pytest.fixture
+    def get_urls(self, one_board_owner_writer_reader_alien):
+        board, owner, writer, reader, alien = one_board_owner_writer_reader_alien
+        category = CategoryFactory.create(user=owner, board=board)
+        goal = GoalFactory.create(user=owner, category=category)
+        comment = CommentFactory.create(user=owner, goal=goal)
+        urls = [
+            # the board also prefetches participants and their users
+            (f'/goals/board/{board.pk}', self.QUERIES + 2),
+            (f'/goals/goal_category/{category.pk}', self.QUERIES),
+            (f'/goals/goal/{goal.pk}', self.QUERIES),
+            (f'/goals/goal_comment/{comment.pk}', self.QUERIES),
+        ]
+        return urls, reader, alien
+
+    @pytest.mark.django_db
+    def test_detail_view_single_query(self, client, get_urls, django_assert_num_queries, settings):
+        urls, reader, alien = get_urls
+        # Without a membership cache the permission has to come from the object query itself
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+        for user, status in [(reader, HTTP_200_OK), (alien, HTTP_403_FORBIDDEN)]:
+            client.force_login(user)
+            for url, queries in urls:
+                with django_assert_num_queries(queries):
+                    response = client.get(url)
+                assert response.status_code == status, \
+                    f'Вернулся код {response.status_code} вместо {status} для {url}'
@@ -0,0 +1,43 @@
+import pytest
+from rest_framework.status import HTTP_200_OK
+from factories import BoardParticipantFactory, CommentFactory, GoalFactory
+from goals.models import BoardParticipant
+from goals.views.mixins import FastListMixin
+
+
+class TestFastList:
+
+    @staticmethod
+    def get_content(client, url, params):
+        response = client.get(url, params)
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK} для {url}'
+        return response.content
+
+    @pytest.mark.django_db
+    def test_fast_list_same_output(self, client_and_category, monkeypatch, settings):
+        client, category = client_and_category
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        goals = GoalFactory.create_batch(size=5, category=category, user=category.user, description=None)
+        goals += GoalFactory.create_batch(size=5, category=category, user=category.user, due_date=None)
+        for goal in goals[:3]:
+            CommentFactory.create(goal=goal, user=category.user)
+        BoardParticipantFactory.create(user=category.user, role=BoardParticipant.Role.reader)
+
+        requests = [
+            ('/goals/goal/list', {}),
+            ('/goals/goal/list', {'limit': 3, 'offset': 2, 'ordering': '-due_date'}),
+            ('/goals/goal/list', {'limit': 3, 'cursor': '', 'ordering': 'due_date'}),
+            ('/goals/goal/list', {'limit': 3, 'count_mode': 'capped', 'fields': 'id,user,due_date'}),
+            ('/goals/goal/list', {'search': goals[0].title}),
+            ('/goals/goal_category/list', {}),
+            ('/goals/goal_category/list', {'limit': 1, 'omit': 'user'}),
+            ('/goals/goal_comment/list', {'ordering': 'created'}),
+            ('/goals/board/list', {'limit': 10}),
+        ]
+        for url, params in requests:
+            fast = self.get_content(client, url, params)
+            monkeypatch.setattr(FastListMixin, 'fast_list', False)
+            regular = self.get_content(client, url, params)
+            monkeypatch.undo()
+            assert fast == regular, f'Ответ отличается от сериализатора для {url} {params}'
@@ -0,0 +1,93 @@
+import pytest
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+
+from factories import CategoryFactory
+from goals.cache import get_list_generation
+from goals.importer import GoalImporter
+from goals.models import CascadeJob, GoalCategory
+
+
+class TestListCache:
+
+    @staticmethod
+    def get(client, url, status=HTTP_200_OK, **headers):
+        response = client.get(url, headers=headers)
+        assert response.status_code == status, \
+            f'Вернулся код {response.status_code} вместо {status} для {url}'
+        return response
+
+    @pytest.mark.django_db
+    def test_list_cached(self, shared_cache, client_and_category, django_assert_num_queries):
+        client, category = client_and_category
+
+        for url in ['/goals/board/list', '/goals/goal_category/list']:
+            response = self.get(client, url)
+            # session and user of both requests
+            with django_assert_num_queries(4):
+                cached = self.get(client, url)
+                assert cached.data == response.data, f'Закешированный ответ отличается для {url}'
+                self.get(client, url, HTTP_304_NOT_MODIFIED, If_None_Match=response['ETag'])
+            assert self.get(client, url + '?limit=1').data != response.data, f'Кеш не учитывает параметры для {url}'
+
+    @pytest.mark.django_db
+    def test_list_cache_invalidated(self, shared_cache, client_and_category):
+        client, category = client_and_category
+        board = category.board
+
+        self.get(client, '/goals/board/list')
+        response = client.put(
+            f'/goals/board/{board.pk}', data={'title': 'new title', 'participants': []}, content_type='application/json'
+        )
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+        assert self.get(client, '/goals/board/list').data[0]['title'] == 'new title', \
+            'Список досок не обновился'
+
+        self.get(client, '/goals/goal_category/list')
+        client.post(
+            '/goals/goal_category/create', data={'title': 'new category', 'board': board.pk},
+            content_type='application/json'
+        )
+        assert len(self.get(client, '/goals/goal_category/list').data) == 2, 'Список категорий не обновился'
+
+        client.delete(f'/goals/goal_category/{category.pk}')
+        assert len(self.get(client, '/goals/goal_category/list').data) == 1, 'Список категорий не обновился'
+
+        client.delete(f'/goals/board/{board.pk}')
+        assert len(self.get(client, '/goals/board/list').data) == 0, 'Список досок не обновился'
+        assert len(self.get(client, '/goals/goal_category/list').data) == 0, 'Список категорий не обновился'
+
+    @pytest.mark.django_db
+    def test_list_not_cached_in_process(self, client_and_category):
+        client, category = client_and_category
+
+        self.get(client, '/goals/goal_category/list')
+        GoalCategory.objects.filter(pk=category.pk).update(title='new title')
+        assert self.get(client, '/goals/goal_category/list').data[0]['title'] == 'new title', \
+            'Список закеширован в памяти процесса'
+
+    @pytest.mark.django_db
+    def test_list_cache_invalidated_by_models(self, shared_cache, user_with_password, client_and_category, settings):
+        settings.DEFERRED_CASCADE = True
+        user, _ = user_with_password
+        client, category = client_and_category
+        board = category.board
+
+        self.get(client, '/goals/board/list')
+        board.title = 'new title'
+        board.save()
+        assert self.get(client, '/goals/board/list').data[0]['title'] == 'new title', 'Список досок не обновился'
+
+        self.get(client, '/goals/goal_category/list')
+        CategoryFactory.create(user=user, board=board)
+        assert len(self.get(client, '/goals/goal_category/list').data) == 2, 'Список категорий не обновился'
+
+        GoalImporter(board.pk, user.pk).run([(1, {'type': 'category', 'title': 'imported'})])
+        assert len(self.get(client, '/goals/goal_category/list').data) == 3, 'Список категорий не обновился'
+
+        category.delete()
+        assert len(self.get(client, '/goals/goal_category/list').data) == 2, 'Список категорий не обновился'
+
+        generation = get_list_generation(user.pk)
+        CascadeJob.objects.create(board=board).run_batch(batch_size=10)
+        assert get_list_generation(user.pk) != generation, 'Списки не обновились после каскада'
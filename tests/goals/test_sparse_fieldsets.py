@@ -0,0 +1,50 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.status import HTTP_200_OK
+from factories import CommentFactory
+
+
+class TestSparseFieldsets:
+
+    @staticmethod
+    def get(client, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK} для {url}'
+        return response.data, ' '.join(query['sql'] for query in queries.captured_queries)
+
+    @pytest.mark.django_db
+    def test_sparse_fieldsets(self, client_and_goal):
+        client, goal = client_and_goal
+        comment = CommentFactory.create(goal=goal, user=goal.user)
+
+        for url in [f'/goals/goal/{goal.pk}', f'/goals/goal_comment/{comment.pk}']:
+            data, sql = self.get(client, url, {'fields': 'id,title,text,unknown'})
+            assert set(data) == {'id', 'title'} or set(data) == {'id', 'text'}, f'Неверные поля для {url}'
+            assert 'JOIN "core_user"' not in sql, f'Пользователь загружается для {url}'
+
+        data, sql = self.get(client, '/goals/goal/list', {'fields': 'id,title', 'limit': 10})
+        assert [set(item) for item in data['results']] == [{'id', 'title'}], 'Неверные поля целей'
+        assert '"description"' not in sql, 'Загружается описание целей'
+
+        data, sql = self.get(client, '/goals/goal/list', {'omit': 'description,user'})
+        assert set(data[0]) == {'id', 'title', 'due_date', 'status', 'priority', 'category', 'created', 'updated'}, \
+            'Неверные поля целей'
+        assert '"description"' not in sql, 'Загружается описание целей'
+
+        data, sql = self.get(client, '/goals/goal_category/list', {'fields': 'title,user'})
+        assert set(data[0]) == {'title', 'user'}, 'Неверные поля категорий'
+        assert data[0]['user']['id'] == goal.user.pk, 'Неверный автор категории'
+
+    @pytest.mark.django_db
+    def test_sparse_fieldsets_ignored_on_write(self, client_and_goal):
+        client, goal = client_and_goal
+
+        response = client.patch(
+            f'/goals/goal/{goal.pk}?fields=id', data={'title': 'new title'}, content_type='application/json'
+        )
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код {response.status_code} вместо {HTTP_200_OK}'
+        assert response.data['title'] == 'new title', 'Поля ответа урезаны при изменении'
@@ -0,0 +1,40 @@
+import pytest
+from rest_framework.status import HTTP_200_OK
+from factories import BoardFactory, BoardParticipantFactory, CategoryFactory
+from goals.models import BoardParticipant
+
+
+class TestTrigramSearch:
+    LIMIT = 300
+
+    def search(self, client, url, params):
+        response = client.get(url, {'limit': self.LIMIT, **params})
+        assert response.status_code is HTTP_200_OK, \
+            f'Вернулся код  {response.status_code} вместо {HTTP_200_OK}'
+        return [item['title'] for item in response.data['results']]
+
+    @pytest.mark.django_db
+    def test_category_trigram_search(self, login_client_with_user, users_board):
+        client, user = login_client_with_user
+        for title in ['Покупки', 'Работа', 'Рабочие встречи']:
+            CategoryFactory.create(user=user, board=users_board, title=title)
+
+        assert self.search(client, '/goals/goal_category/list', {'search': 'раб'}) == \
+               ['Работа', 'Рабочие встречи'], 'Не работает обычный поиск'
+        assert self.search(client, '/goals/goal_category/list', {'search': 'Рабта', 'fuzzy': 'true'})[0] == \
+               'Работа', 'Не работает поиск с опечаткой'
+        assert self.search(client, '/goals/goal_category/list', {'search': 'Рабта'}) == [], \
+            'Поиск с опечаткой включился без параметра fuzzy'
+
+    @pytest.mark.django_db
+    def test_board_trigram_search(self, login_client_with_user):
+        client, user = login_client_with_user
+        for title in ['Домашние дела', 'Проект Alpha', 'Проект Beta']:
+            board = BoardFactory.create(title=title)
+            BoardParticipantFactory.create(user=user, board=board, role=BoardParticipant.Role.owner)
+        BoardFactory.create(title='Проект Gamma')
+
+        assert self.search(client, '/goals/board/list', {'search': 'проект'}) == \
+               ['Проект Alpha', 'Проект Beta'], 'Не работает поиск по доскам'
+        assert self.search(client, '/goals/board/list', {'search': 'Дамашние', 'fuzzy': '1'}) == \
+               ['Домашние дела'], 'Не работает поиск по доскам с опечаткой'